@@ -72,7 +72,12 @@ def calculate(para_setup):
     method = str(paras[11])    
     pc_alpha = str(paras[12])
     tau_max = int(paras[13])
-    n_bs = int(paras[14])
+    # Bootstrap methods run max(n_bs_list) realizations and also return the
+    # results of the first n_bs realizations for every n_bs in n_bs_list
+    n_bs_list = [int(n_bs) for n_bs in paras[14].split('_')]
+    n_bs = max(n_bs_list)
+    nested_results = None
+    nested_computation_time = None
     #############################################
     ##  Data
     #############################################
@@ -365,7 +370,9 @@ def calculate(para_setup):
             "max_conds_px_lagged": max_conds_px_lagged,
             "fdr_method":'none'}
 
-        pcmcires = pcmci.run_bootstrap_of('run_pcmciplus',pcmci_arg,boot_samples =n_bs, boot_blocklength=1, )
+        pcmcires = pcmci.run_bootstrap_of('run_pcmciplus',pcmci_arg,boot_samples =n_bs, boot_blocklength=1, nested_boot_samples=n_bs_list)
+        nested_results = pcmcires['nested_summary_results']
+        nested_computation_time = pcmcires['nested_computation_time']
         graph_bool = pcmcires['summary_results']['most_frequent_links']
         graph= graph_bool
         val_min = np.abs(pcmcires['summary_results']['val_matrix_mean'])
@@ -405,7 +412,9 @@ def calculate(para_setup):
             "mode": 'standard',
             "contemp_collider_rule":'majority',
             "conflict_resolution": True,}
-        pcmcires = pcmci.run_bootstrap_of('run_pcalg',pcmci_arg,boot_samples =n_bs, boot_blocklength=1, )
+        pcmcires = pcmci.run_bootstrap_of('run_pcalg',pcmci_arg,boot_samples =n_bs, boot_blocklength=1, nested_boot_samples=n_bs_list)
+        nested_results = pcmcires['nested_summary_results']
+        nested_computation_time = pcmcires['nested_computation_time']
         graph_bool = pcmcires['summary_results']['most_frequent_links']
         graph= graph_bool
         val_min = np.abs(pcmcires['summary_results']['val_matrix_mean'])
@@ -437,7 +446,9 @@ def calculate(para_setup):
             "n_preliminary_iterations": 0,
             "prelim_only": False,
             }
-        boot_lpcmci_res = lpcmci.run_bootstrap_of('run_lpcmci',lpcmci_arg,boot_samples =n_bs, boot_blocklength=1, )
+        boot_lpcmci_res = lpcmci.run_bootstrap_of('run_lpcmci',lpcmci_arg,boot_samples =n_bs, boot_blocklength=1, nested_boot_samples=n_bs_list)
+        nested_results = boot_lpcmci_res['nested_summary_results']
+        nested_computation_time = boot_lpcmci_res['nested_computation_time']
         graph_bool = boot_lpcmci_res['summary_results']['most_frequent_links']
         graph= graph_bool
         val_min = np.abs(boot_lpcmci_res['summary_results']['val_matrix_mean'])
@@ -494,16 +505,39 @@ def calculate(para_setup):
                 print(graph[:,:,lag])
             raise ValueError("Wrong graph in Oracle case for ", para_setup_string, model_seed)
 
-    return {
-            'true_graph':true_graph,
+    # Graphs are stored in the compact uint8 encoding of PCMCI.encode_graph
+    results = {
+            'true_graph':PCMCI.encode_graph(true_graph),
             'val_min':val_min,
             'max_cardinality':max_cardinality,
 
             # Method results
             'computation_time': computation_time,
-            'graph':graph,
+            'graph':PCMCI.encode_graph(graph),
             }
 
+    if nested_results is None:
+        return {n_bs_list[0]: results}
+
+    nested = {}
+    for n_bs_here in n_bs_list:
+        nested[n_bs_here] = dict(results)
+        nested[n_bs_here]['graph'] = PCMCI.encode_graph(
+                                nested_results[n_bs_here]['most_frequent_links'])
+        nested[n_bs_here]['val_min'] = np.abs(nested_results[n_bs_here]['val_matrix_mean'])
+        # Measured time until the first n_bs_here realizations were done,
+        # instead of the time of all n_bs realizations
+        nested[n_bs_here]['computation_time'] = (computation_time
+                                    - nested_computation_time[n_bs]
+                                    + nested_computation_time[n_bs_here])
+    return nested
+
+
+def nested_configurations(conf):
+    """Returns the configurations saved for conf, one for each n_bs."""
+    paras = conf.split('-')
+    return [('-'.join(paras[:-1] + [n_bs]), int(n_bs)) for n_bs in paras[-1].split('_')]
+
 
 def process_chunks(job_id, chunk):
 
@@ -531,13 +565,14 @@ def master():
 
     print("Starting with num_cpus = ", num_cpus)
 
-    all_configs = dict([(conf, {'results':{}, 
+    all_configs = dict([(nested_conf, {'results':{}, 
         "graphs":{}, 
         "val_min":{}, 
         "max_cardinality":{}, 
 
         "true_graph":{}, 
-        "computation_time":{},} ) for conf in config_list])
+        "computation_time":{},} ) for conf in config_list
+                                  for (nested_conf, _) in nested_configurations(conf)])
 
     job_list = [(conf, i) for i in range(samples) for conf in config_list]
 
@@ -567,15 +602,16 @@ def master():
         for conf_sam in list(tmp.keys()):
             config = conf_sam[0]
             sample = conf_sam[1]
-            all_configs[config]['results'][sample] = tmp[conf_sam]
+            for (nested_conf, n_bs) in nested_configurations(config):
+                all_configs[nested_conf]['results'][sample] = tmp[conf_sam][n_bs]
 
 
     print("\nsaving all configs...")
 
     for conf in list(all_configs.keys()):
 
-        all_configs[conf]['graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['graph'].shape, dtype='<U3')
-        all_configs[conf]['true_graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['true_graph'].shape, dtype='<U3')
+        all_configs[conf]['graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['graph'].shape, dtype='uint8')
+        all_configs[conf]['true_graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['true_graph'].shape, dtype='uint8')
         all_configs[conf]['val_min'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['val_min'].shape)
         all_configs[conf]['max_cardinality'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['max_cardinality'].shape)
 
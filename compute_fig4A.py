@@ -119,8 +119,10 @@ def calculate(num_scm_model):
                 if lag == 0:
                     scm_graph[v,u,abs(lag)] = "<--"
 
-    graphs = np.empty((repetions, N, N, tau_max + 1), dtype='<U3')
-    boot_graphs = np.empty((repetions, N, N, tau_max + 1), dtype='<U3')
+    # Graphs are stored in the compact uint8 encoding of PCMCI.encode_graph
+    scm_graph = PCMCI.encode_graph(scm_graph)
+    graphs = np.empty((repetions, N, N, tau_max + 1), dtype='uint8')
+    boot_graphs = np.empty((repetions, N, N, tau_max + 1), dtype='uint8')
 
     boot_linkfreq = np.empty((repetions, N, N, tau_max + 1))
     boot_linkfreq_mean = np.empty((N, N, tau_max + 1))
@@ -130,7 +132,7 @@ def calculate(num_scm_model):
     true_linkfreq_boot_mean= np.empty((N, N, tau_max + 1))
     true_linkfreq_boot_std= np.empty((N, N, tau_max + 1))
     
-    true_graph = np.empty((N, N, tau_max + 1), dtype='<U3')
+    true_graph = np.empty((N, N, tau_max + 1), dtype='uint8')
     
     #With this stationary SCM we generate "repetions" samples
     start_retry = 0
@@ -160,7 +162,7 @@ def calculate(num_scm_model):
         results = pcmci.run_pcmciplus(tau_min=tau_min, tau_max=tau_max, pc_alpha=pc_alpha)
         #Save PCMCI+ graph 
         #(Frequency of links in calculated after all repetitions are finished)
-        graphs[ir] = results['graph']
+        graphs[ir] = PCMCI.encode_graph(results['graph'])
 
         ##Bootstrapped PCMCIplus
         pcmci = PCMCI(dataframe=dataframe,
@@ -176,7 +178,7 @@ def calculate(num_scm_model):
                 seed=ir+2565)['summary_results']
         #Save output graph and link frequency
         boot_linkfreq[ir] = results['link_frequency']
-        boot_graphs[ir] = results['most_frequent_links']
+        boot_graphs[ir] = PCMCI.encode_graph(results['most_frequent_links'])
 
     # Get PCMCI+ frequency (True/Ground truth frequency)
     summary = pcmci.return_summary_results({'graph':graphs, 'val_matrix':np.zeros(graphs.shape)})
@@ -457,14 +457,15 @@ def calculate(para_setup):
                 print(graph[:,:,lag])
             raise ValueError("Wrong graph in Oracle case for ", para_setup_string, model_seed)
 
+    # Graphs are stored in the compact uint8 encoding of PCMCI.encode_graph
     return {
-            'true_graph':true_graph,
+            'true_graph':PCMCI.encode_graph(true_graph),
             'val_min':val_min,
             'max_cardinality':max_cardinality,
 
             # Method results
             'computation_time': computation_time,
-            'graph': graph,
+            'graph': PCMCI.encode_graph(graph),
             'link_frequency': link_freq 
             }
 
@@ -540,9 +541,9 @@ def master():
 
     for conf in list(all_configs.keys()):
 
-        all_configs[conf]['graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['graph'].shape, dtype='<U3')
+        all_configs[conf]['graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['graph'].shape, dtype='uint8')
 
-        all_configs[conf]['true_graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['true_graph'].shape, dtype='<U3')
+        all_configs[conf]['true_graphs'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['true_graph'].shape, dtype='uint8')
         all_configs[conf]['val_min'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['val_min'].shape)
         all_configs[conf]['max_cardinality'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['max_cardinality'].shape)
         all_configs[conf]['link_frequency'] = np.zeros((samples, ) + all_configs[conf]['results'][0]['link_frequency'].shape)
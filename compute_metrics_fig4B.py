@@ -7,6 +7,8 @@ import scipy
 import statsmodels.api as sm # recommended import according to the docs
 from copy import deepcopy
 
+from tigramite.pcmci_base import PCMCIbase
+
 #Script to compute the mean absolute frequency errors of Fig5B 
 folder_name = './' #PATH OF NUMERICAL EXP
 save_folder= os.path.join(folder_name,'')
@@ -131,6 +133,9 @@ def get_numbers(metrics, orig_true_graphs, orig_pred_graphs, true_link_freq, pre
     n_realizations = len(orig_pred_graphs)
     metrics_dict = {}
 
+    # Compare link types as integer codes, see PCMCIbase.encode_graph
+    orig_pred_graphs = PCMCIbase.encode_graph(orig_pred_graphs)
+    orig_true_graphs = PCMCIbase.encode_graph(orig_true_graphs)
     pred_graphs = orig_pred_graphs
     true_graphs = orig_true_graphs
 
@@ -140,24 +145,24 @@ def get_numbers(metrics, orig_true_graphs, orig_pred_graphs, true_link_freq, pre
     true_link_freq_masked = np.ma.array(true_link_freq,mask= ~(cross_mask*lagged_mask))
     pred_link_freq_masked = np.ma.array(pred_link_freq,mask= ~(cross_mask*lagged_mask))
     metrics_dict['adj_lagged_abs_freq_diff'] = ((afd_func(true_link_freq_masked,pred_link_freq_masked)).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_lagged_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_lagged_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked=="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked=="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_lagged_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!=0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!=0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_lagged_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked==0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked==0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
     
     #Auto links (and absent, existing, all)
     true_link_masked = np.ma.array(orig_true_graphs,mask= ~auto_mask)
     true_link_freq_masked = np.ma.array(true_link_freq,mask= ~auto_mask)
     pred_link_freq_masked = np.ma.array(pred_link_freq,mask= ~auto_mask)
     metrics_dict['adj_auto_abs_freq_diff'] = ((afd_func(true_link_freq_masked,pred_link_freq_masked)).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_auto_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_auto_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked=="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked=="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_auto_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!=0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!=0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_auto_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked==0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked==0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
 
     #Contemp links (absent existing and all)
     true_link_masked = np.ma.array(orig_true_graphs,mask= ~contemp_cross_mask_tril)
     true_link_freq_masked = np.ma.array(true_link_freq,mask= ~contemp_cross_mask_tril)
     pred_link_freq_masked = np.ma.array(pred_link_freq,mask= ~contemp_cross_mask_tril)
     metrics_dict['adj_contemp_abs_freq_diff'] = ((afd_func(true_link_freq_masked,pred_link_freq_masked)).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_contemp_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_contemp_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked=="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked=="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_contemp_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!=0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!=0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_contemp_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked==0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked==0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
 
     
     #Links with different freq only (absent existing all)
@@ -165,16 +170,16 @@ def get_numbers(metrics, orig_true_graphs, orig_pred_graphs, true_link_freq, pre
     true_link_freq_masked = np.ma.array(true_link_freq,mask= true_freq_not_1_mask)
     pred_link_freq_masked = np.ma.array(pred_link_freq,mask= true_freq_not_1_mask)
     metrics_dict['adj_not1_abs_freq_diff'] = ((afd_func(true_link_freq_masked,pred_link_freq_masked)).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_not1_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_not1_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked=="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked=="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_not1_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!=0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!=0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_not1_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked==0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked==0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
     
     #All links (and absent, existing, all)
     true_link_masked = np.ma.array(orig_true_graphs,mask= ~any_mask)
     true_link_freq_masked = np.ma.array(true_link_freq,mask= ~any_mask)
     pred_link_freq_masked = np.ma.array(pred_link_freq,mask= ~any_mask)
     metrics_dict['adj_anylink_abs_freq_diff'] = ((afd_func(true_link_freq_masked,pred_link_freq_masked)).mean(axis=(1,2,3)),1)      
-    metrics_dict['adj_anylink_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
-    metrics_dict['adj_anylink_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked=="",true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked=="",pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_anylink_abs_freq_diff_existing'] = ((afd_func(np.ma.where(true_link_masked!=0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked!=0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
+    metrics_dict['adj_anylink_abs_freq_diff_absent'] = ((afd_func(np.ma.where(true_link_masked==0,true_link_freq_masked,np.ma.array([0],mask=True)),np.ma.where(true_link_masked==0,pred_link_freq_masked,np.ma.array([0],mask=True)))).mean(axis=(1,2,3)),1)
     
     for metric in metrics_dict.keys():
 
@@ -86,13 +86,15 @@ for model in ['random_lineargaussian_highdegree']: # random_linearmixed_highdegr
                             name = name[:-1]
                             anyconfigurations += [name]
                         else:
-                            for n_bs in [25,50,100,200]: #number of bootstrap realizations
-                                pc_alpha = np.format_float_positional(np.float(pc_alpha),trim='-')
-                                para_setup = (model, N, n_links, min_coeff, coeff, auto, contemp_fraction, frac_unobserved, max_true_lag, T, ci_test, method, pc_alpha, tau_max,
-                                                        n_bs)
-                                name = '%s-'*len(para_setup) % para_setup
-                                name = name[:-1]
-                                anyconfigurations += [name]
+                            # One job runs max(n_bs_list) bootstrap realizations and saves
+                            # the results of the first n_bs realizations for every n_bs
+                            n_bs_list = [25,50,100,200] #number of bootstrap realizations
+                            pc_alpha = np.format_float_positional(np.float(pc_alpha),trim='-')
+                            para_setup = (model, N, n_links, min_coeff, coeff, auto, contemp_fraction, frac_unobserved, max_true_lag, T, ci_test, method, pc_alpha, tau_max,
+                                                    '_'.join(str(n_bs) for n_bs in n_bs_list))
+                            name = '%s-'*len(para_setup) % para_setup
+                            name = name[:-1]
+                            anyconfigurations += [name]
 
 
 current_results_files = [f for f in listdir(mypath) if isfile(join(mypath, f))]
@@ -104,7 +106,10 @@ for conf in anyconfigurations:
     if conf not in configurations:
         conf = conf.replace("'","")
 
-        if (overwrite == False) and (conf + '.dat' in current_results_files):
+        # Configurations with several n_bs are done once all their files exist
+        paras = conf.split('-')
+        nested_files = ['-'.join(paras[:-1] + [n_bs]) + '.dat' for n_bs in paras[-1].split('_')]
+        if (overwrite == False) and all(f in current_results_files for f in nested_files):
             already_there.append(conf)
             pass
         else:
@@ -8,6 +8,8 @@ import statsmodels.api as sm # recommended import according to the docs
 
 from copy import deepcopy
 
+from tigramite.pcmci_base import PCMCIbase, GRAPH_LINK_TYPES
+
 
 save_type = 'pdf'
 
@@ -88,42 +90,33 @@ def get_masks(true_graphs):
 
     return cross_mask, contemp_cross_mask_tril, lagged_mask, auto_mask, any_mask, tau_max
 
-def _get_match_score(true_link, pred_link):
-    if true_link == "" or pred_link == "": return 0
-    count = 0
-    # If left edgemark is correct add 1
-    if true_link[0] == pred_link[0]:
-        count += 1
-    # If right edgemark is correct add 1
-    if true_link[2] == pred_link[2]:
-        count += 1
-    return count
-match_func = np.vectorize(_get_match_score, otypes=[int]) 
-
-
-def _get_conflicts(pred_link):
-    if pred_link == "": return 0
-    count = 0
-    # If left edgemark is conflict add 1
-    if pred_link[0] == 'x':
-        count += 1
-    # If right edgemark is conflict add 1
-    if pred_link[2] == 'x':
-        count += 1
-    return count
-conflict_func = np.vectorize(_get_conflicts, otypes=[int]) 
-
-def _get_unoriented(true_link):
-    if true_link == "": return 0
-    count = 0
-    # If left edgemark is unoriented add 1
-    if true_link[0] == 'o':
-        count += 1
-    # If right edgemark is unoriented add 1
-    if true_link[2] == 'o':
-        count += 1
-    return count
-unoriented_func = np.vectorize(_get_unoriented, otypes=[int]) 
+# Left and right edgemarks of every link type code of graphs encoded by
+# PCMCIbase.encode_graph, integer-coded so that they are compared as integers
+_, _edgemark_codes = np.unique(
+    [link[:1] for link in GRAPH_LINK_TYPES] + [link[2:] for link in GRAPH_LINK_TYPES],
+    return_inverse=True)
+_left_edgemarks, _right_edgemarks = np.split(_edgemark_codes, 2)
+
+def _count_edgemarks(mark):
+    """Returns the number of edgemarks equal to mark for every link type code."""
+    return np.array([(link[:1] == mark) + (link[2:] == mark)
+                     for link in GRAPH_LINK_TYPES], dtype=int)
+
+def match_func(true_graphs, pred_graphs):
+    # Number of correct edgemarks, 0 if either link is absent
+    count = ((_left_edgemarks[true_graphs] == _left_edgemarks[pred_graphs]).astype(int)
+             + (_right_edgemarks[true_graphs] == _right_edgemarks[pred_graphs]))
+    return count * ((true_graphs != 0) & (pred_graphs != 0))
+
+_conflicts = _count_edgemarks('x')
+def conflict_func(pred_graphs):
+    # Number of conflicting edgemarks
+    return _conflicts[pred_graphs]
+
+_unoriented = _count_edgemarks('o')
+def unoriented_func(true_graphs):
+    # Number of unoriented edgemarks
+    return _unoriented[true_graphs]
 
 def get_numbers(metrics, orig_true_graphs, orig_pred_graphs, val_min, cardinality, computation_time, boot_samples=200):
 
@@ -134,132 +127,134 @@ def get_numbers(metrics, orig_true_graphs, orig_pred_graphs, val_min, cardinalit
 
     metrics_dict = {}
 
-    pred_graphs = orig_pred_graphs
-    true_graphs = orig_true_graphs
-
-    metrics_dict['valmin_lagged'] = (((true_graphs!="")*np.abs(val_min)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['valmin_auto'] = (((true_graphs!="")*np.abs(val_min)*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['valmin_contemp'] = (((true_graphs!="")*np.abs(val_min)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['valmin_anylink'] = (((true_graphs!="")*np.abs(val_min)*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) ) 
-
-    metrics_dict['cardinality_lagged'] = (((true_graphs!="")*cardinality*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['cardinality_auto'] = (((true_graphs!="")*cardinality*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['cardinality_contemp'] = (((true_graphs!="")*cardinality*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['cardinality_anylink'] = (((true_graphs!="")*cardinality*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) ) 
-
-    metrics_dict['num_links_lagged'] = (((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+    # Compare link types as integer codes, see PCMCIbase.encode_graph
+    pred_graphs = PCMCIbase.encode_graph(orig_pred_graphs)
+    true_graphs = PCMCIbase.encode_graph(orig_true_graphs)
+    link_code = {link: code for code, link in enumerate(GRAPH_LINK_TYPES)}
+
+    metrics_dict['valmin_lagged'] = (((true_graphs!=0)*np.abs(val_min)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['valmin_auto'] = (((true_graphs!=0)*np.abs(val_min)*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['valmin_contemp'] = (((true_graphs!=0)*np.abs(val_min)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['valmin_anylink'] = (((true_graphs!=0)*np.abs(val_min)*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) ) 
+
+    metrics_dict['cardinality_lagged'] = (((true_graphs!=0)*cardinality*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['cardinality_auto'] = (((true_graphs!=0)*cardinality*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['cardinality_contemp'] = (((true_graphs!=0)*cardinality*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['cardinality_anylink'] = (((true_graphs!=0)*cardinality*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) ) 
+
+    metrics_dict['num_links_lagged'] = (((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
                         (cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['num_links_auto'] = (((true_graphs!="")*auto_mask).sum(axis=(1,2,3)),
+    metrics_dict['num_links_auto'] = (((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)),
                         (auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['num_links_contemp'] = (((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+    metrics_dict['num_links_contemp'] = (((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
                         (contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['num_links_anylink'] = (((true_graphs!="")*any_mask).sum(axis=(1,2,3)),
+    metrics_dict['num_links_anylink'] = (((true_graphs!=0)*any_mask).sum(axis=(1,2,3)),
                         (any_mask).sum(axis=(1,2,3)) ) 
 
-    metrics_dict['directed_lagged'] = (((true_graphs=="-->")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['directed_auto'] = (((true_graphs=="-->")*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['directed_contemp'] = ((np.logical_or(true_graphs=="-->", true_graphs=="<--")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['directed_anylink'] = ((np.logical_or(true_graphs=="-->", true_graphs=="<--")*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) ) 
-
-    metrics_dict['bidirected_lagged'] = (((true_graphs=="<->")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['bidirected_auto'] = (((true_graphs=="<->")*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['bidirected_contemp'] = (((true_graphs=="<->")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['bidirected_anylink'] = (((true_graphs=="<->")*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) ) 
+    metrics_dict['directed_lagged'] = (((true_graphs==link_code["-->"])*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['directed_auto'] = (((true_graphs==link_code["-->"])*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['directed_contemp'] = ((np.logical_or(true_graphs==link_code["-->"], true_graphs==link_code["<--"])*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['directed_anylink'] = ((np.logical_or(true_graphs==link_code["-->"], true_graphs==link_code["<--"])*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) ) 
+
+    metrics_dict['bidirected_lagged'] = (((true_graphs==link_code["<->"])*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['bidirected_auto'] = (((true_graphs==link_code["<->"])*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['bidirected_contemp'] = (((true_graphs==link_code["<->"])*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['bidirected_anylink'] = (((true_graphs==link_code["<->"])*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) ) 
 
     # Adjacency true/false positives and precision/recall, separated by lagged/auto/contemp
-    metrics_dict['adj_lagged_fpr'] = ( ((true_graphs=="")*(pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)),  
-                                          ((true_graphs=="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_lagged_tpr'] = (((true_graphs!="")*(pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_auto_fpr'] = (((true_graphs=="")*(pred_graphs!="")*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs=="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_auto_tpr'] = (((true_graphs!="")*(pred_graphs!="")*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_contemp_fpr'] = (((true_graphs=="")*(pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs=="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['adj_contemp_tpr'] = (((true_graphs!="")*(pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-
-    metrics_dict['adj_anylink_fpr'] = (((true_graphs=="")*(pred_graphs!="")*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs=="")*any_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_anylink_tpr'] = (((true_graphs!="")*(pred_graphs!="")*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) )            
-
-
-    metrics_dict['adj_lagged_precision'] = (((true_graphs!="")*(pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_lagged_recall'] = (((true_graphs!="")*(pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_auto_precision'] = (((true_graphs!="")*(pred_graphs!="")*auto_mask).sum(axis=(1,2,3)),
-                        ((pred_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_auto_recall'] = (((true_graphs!="")*(pred_graphs!="")*auto_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_contemp_precision'] = (((true_graphs!="")*(pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-    metrics_dict['adj_contemp_recall'] = (((true_graphs!="")*(pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
-
-    metrics_dict['adj_anylink_precision'] = (((true_graphs!="")*(pred_graphs!="")*any_mask).sum(axis=(1,2,3)),
-                        ((pred_graphs!="")*any_mask).sum(axis=(1,2,3)) )
-    metrics_dict['adj_anylink_recall'] = (((true_graphs!="")*(pred_graphs!="")*any_mask).sum(axis=(1,2,3)),
-                        ((true_graphs!="")*any_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_lagged_fpr'] = ( ((true_graphs==0)*(pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)),  
+                                          ((true_graphs==0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_lagged_tpr'] = (((true_graphs!=0)*(pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_auto_fpr'] = (((true_graphs==0)*(pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs==0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_auto_tpr'] = (((true_graphs!=0)*(pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_contemp_fpr'] = (((true_graphs==0)*(pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs==0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['adj_contemp_tpr'] = (((true_graphs!=0)*(pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+
+    metrics_dict['adj_anylink_fpr'] = (((true_graphs==0)*(pred_graphs!=0)*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs==0)*any_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_anylink_tpr'] = (((true_graphs!=0)*(pred_graphs!=0)*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) )            
+
+
+    metrics_dict['adj_lagged_precision'] = (((true_graphs!=0)*(pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_lagged_recall'] = (((true_graphs!=0)*(pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_auto_precision'] = (((true_graphs!=0)*(pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)),
+                        ((pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_auto_recall'] = (((true_graphs!=0)*(pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_contemp_precision'] = (((true_graphs!=0)*(pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+    metrics_dict['adj_contemp_recall'] = (((true_graphs!=0)*(pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+
+    metrics_dict['adj_anylink_precision'] = (((true_graphs!=0)*(pred_graphs!=0)*any_mask).sum(axis=(1,2,3)),
+                        ((pred_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
+    metrics_dict['adj_anylink_recall'] = (((true_graphs!=0)*(pred_graphs!=0)*any_mask).sum(axis=(1,2,3)),
+                        ((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
 
 
     # Edge mark precision and recall
     metrics_dict['edgemarks_lagged_precision'] = ((match_func(true_graphs,
                                                                pred_graphs)*(cross_mask*lagged_mask)).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
 
     metrics_dict['edgemarks_lagged_recall'] = ((match_func(true_graphs, pred_graphs)*(cross_mask*lagged_mask)).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
     metrics_dict['edgemarks_auto_precision'] = ((match_func(true_graphs, pred_graphs)*auto_mask).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
     metrics_dict['edgemarks_auto_recall'] = ((match_func(true_graphs, pred_graphs)*auto_mask).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
     metrics_dict['edgemarks_contemp_precision'] = ((match_func(true_graphs, pred_graphs)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
     metrics_dict['edgemarks_contemp_recall'] = ((match_func(true_graphs, pred_graphs)*contemp_cross_mask_tril).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
 
     metrics_dict['edgemarks_anylink_precision'] = ((match_func(true_graphs, pred_graphs)*any_mask).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*any_mask).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
     metrics_dict['edgemarks_anylink_recall'] = ((match_func(true_graphs, pred_graphs)*any_mask).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*any_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
 
     # Unoriented marks in true_graph and conflicts in pred_graph
     metrics_dict['unoriented_lagged'] = ((unoriented_func(true_graphs)*(cross_mask*lagged_mask)).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
     metrics_dict['conflicts_lagged'] = ((conflict_func(pred_graphs)*(cross_mask*lagged_mask)).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*cross_mask*lagged_mask).sum(axis=(1,2,3)) )
     metrics_dict['unoriented_auto'] = ((unoriented_func(true_graphs)*(auto_mask)).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
     metrics_dict['conflicts_auto'] = ((conflict_func(pred_graphs)*(auto_mask)).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*auto_mask).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*auto_mask).sum(axis=(1,2,3)) )
     metrics_dict['unoriented_contemp'] = ((unoriented_func(true_graphs)*(contemp_cross_mask_tril)).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
     metrics_dict['conflicts_contemp'] = ((conflict_func(pred_graphs)*(contemp_cross_mask_tril)).sum(axis=(1,2,3)),
-                                                        2.*((pred_graphs!="")*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
+                                                        2.*((pred_graphs!=0)*contemp_cross_mask_tril).sum(axis=(1,2,3)) )
 
     metrics_dict['unoriented_anylink'] = ((unoriented_func(true_graphs)*(any_mask)).sum(axis=(1,2,3)),
-                                                        2.*((true_graphs!="")*any_mask).sum(axis=(1,2,3)) )
+                                                        2.*((true_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
     metrics_dict['conflicts_anylink'] = ((conflict_func(pred_graphs)*(any_mask)).sum(axis=(1,2,3)),
-                                                            2.*((pred_graphs!="")*any_mask).sum(axis=(1,2,3)) )
+                                                            2.*((pred_graphs!=0)*any_mask).sum(axis=(1,2,3)) )
     
     for metric in metrics_dict.keys():
 
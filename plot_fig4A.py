@@ -68,6 +68,8 @@ dist_func = np.vectorize(distance_to_diag, otypes=[float])
 results = pickle.load(open(save_folder+'true_vs_boot_linkfreq_%d-%d-%d-%d-%d-%d-%d-%f.dat' %(scm_models,N,L,T,tau_max,boot_samples,repetions,pc_alpha),"rb"))
 print("Loading results from %s" %(save_folder+'true_vs_boot_linkfreq_%d-%d-%d-%d-%d-%d-%d-%f.dat' %(scm_models,N,L,T,tau_max,boot_samples,repetions,pc_alpha)))
 true_link_freq = results["true_linkfreq"]
+# Graphs are stored in the uint8 encoding of PCMCI.encode_graph, where 0 is
+# the absent link
 true_links = results["true_graph"]
 averaged_boot_linkfreq = results["boot_linkfreq_mean"]
 std_boot_linkfreq = results["boot_linkfreq_std"]
@@ -103,18 +105,18 @@ averaged_boot_linkfreq_anymask = np.ma.array(averaged_boot_linkfreq, mask = any_
 
 #########Absent links:
 print("Absent links")
-print("results over %d true existing links" % true_link_freq_anymask[true_links_anymask!=''].count())
-print("results over %d true absent links" % true_link_freq_anymask[true_links_anymask==''].count())
+print("results over %d true existing links" % true_link_freq_anymask[true_links_anymask!=0].count())
+print("results over %d true absent links" % true_link_freq_anymask[true_links_anymask==0].count())
 print("Scatter plot should be around the diagonal")
 ### ALL LINKS
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_anymask[true_links_anymask==''] == averaged_boot_linkfreq_anymask[true_links_anymask=='']).sum()
-n_cross_line_absent_links = cross_line_func(x=true_link_freq_anymask[true_links_anymask==''], y=averaged_boot_linkfreq_anymask[true_links_anymask==''], 
-                xerr= true_freq_boot_std[true_links_anymask==''], yerr=std_boot_linkfreq[true_links_anymask=='']).sum()
-n_cross_line_absent_links_no_xerr = cross_line_func(x=true_link_freq_anymask[true_links_anymask==''], y=averaged_boot_linkfreq_anymask[true_links_anymask==''], 
-xerr= 0*true_freq_boot_std[true_links_anymask==''], yerr=std_boot_linkfreq[true_links_anymask=='']).sum()
-n_absent_links = true_link_freq_anymask[true_links_anymask==''].count()
-mrse = dist_func(true_link_freq_anymask[true_links_anymask==''],averaged_boot_linkfreq_anymask[true_links_anymask=='']).mean()
+n_same_freq = (true_link_freq_anymask[true_links_anymask==0] == averaged_boot_linkfreq_anymask[true_links_anymask==0]).sum()
+n_cross_line_absent_links = cross_line_func(x=true_link_freq_anymask[true_links_anymask==0], y=averaged_boot_linkfreq_anymask[true_links_anymask==0], 
+                xerr= true_freq_boot_std[true_links_anymask==0], yerr=std_boot_linkfreq[true_links_anymask==0]).sum()
+n_cross_line_absent_links_no_xerr = cross_line_func(x=true_link_freq_anymask[true_links_anymask==0], y=averaged_boot_linkfreq_anymask[true_links_anymask==0], 
+xerr= 0*true_freq_boot_std[true_links_anymask==0], yerr=std_boot_linkfreq[true_links_anymask==0]).sum()
+n_absent_links = true_link_freq_anymask[true_links_anymask==0].count()
+mrse = dist_func(true_link_freq_anymask[true_links_anymask==0],averaged_boot_linkfreq_anymask[true_links_anymask==0]).mean()
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,(100*n_same_freq/n_absent_links)))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_absent_links/n_absent_links))
 print("Frequency of points crossing the x=y line (without xerr): %.2f %%" %(100*n_cross_line_absent_links_no_xerr/n_absent_links))
@@ -122,7 +124,7 @@ print("Frequency of points crossing the x=y line (removing same freq. edge): %.2
 
 fig = plt.figure(figsize=(9,5))
 ax = fig.add_subplot(231)
-ax.errorbar(x=true_link_freq_anymask[true_links_anymask==''], y=averaged_boot_linkfreq_anymask[true_links_anymask==''], xerr= true_freq_boot_std[true_links_anymask==''], yerr=std_boot_linkfreq[true_links_anymask==''],
+ax.errorbar(x=true_link_freq_anymask[true_links_anymask==0], y=averaged_boot_linkfreq_anymask[true_links_anymask==0], xerr= true_freq_boot_std[true_links_anymask==0], yerr=std_boot_linkfreq[true_links_anymask==0],
     color='orange', fmt="o", label='absent links',ecolor='grey',markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
@@ -143,18 +145,18 @@ ax.text(1,0.32,"Mean Absolute Error %.3f%%"%mrse,
 ### CONTEMP LINKS
 print("Contemporaneous only")
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_contempmask[true_links_contempmask==''] == averaged_boot_linkfreq_contempmask[true_links_contempmask=='']).sum()
-n_cross_line_absent_links = cross_line_func(x=true_link_freq_contempmask[true_links_contempmask==''], y=averaged_boot_linkfreq_contempmask[true_links_contempmask==''], 
-                xerr= true_freq_boot_std[true_links_contempmask==''], yerr=std_boot_linkfreq[true_links_contempmask=='']).sum()
-n_absent_links = true_link_freq_contempmask[true_links_contempmask==''].count()
-mrse = dist_func(true_link_freq_contempmask[true_links_contempmask==''],averaged_boot_linkfreq_contempmask[true_links_contempmask=='']).mean()
+n_same_freq = (true_link_freq_contempmask[true_links_contempmask==0] == averaged_boot_linkfreq_contempmask[true_links_contempmask==0]).sum()
+n_cross_line_absent_links = cross_line_func(x=true_link_freq_contempmask[true_links_contempmask==0], y=averaged_boot_linkfreq_contempmask[true_links_contempmask==0], 
+                xerr= true_freq_boot_std[true_links_contempmask==0], yerr=std_boot_linkfreq[true_links_contempmask==0]).sum()
+n_absent_links = true_link_freq_contempmask[true_links_contempmask==0].count()
+mrse = dist_func(true_link_freq_contempmask[true_links_contempmask==0],averaged_boot_linkfreq_contempmask[true_links_contempmask==0]).mean()
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,100*n_same_freq/n_absent_links))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_absent_links/n_absent_links))
 print("Frequency of points crossing the x=y line (removing same freq. edge): %.2f %%"%(100*(n_cross_line_absent_links-n_same_freq)/(n_absent_links-n_same_freq)))
 
 ax = fig.add_subplot(232)
-ax.errorbar(x=true_link_freq_contempmask[true_links_contempmask==''], y=averaged_boot_linkfreq_contempmask[true_links_contempmask==''], 
-            xerr= true_freq_boot_std[true_links_contempmask==''], yerr=std_boot_linkfreq[true_links_contempmask==''],
+ax.errorbar(x=true_link_freq_contempmask[true_links_contempmask==0], y=averaged_boot_linkfreq_contempmask[true_links_contempmask==0], 
+            xerr= true_freq_boot_std[true_links_contempmask==0], yerr=std_boot_linkfreq[true_links_contempmask==0],
     color='orange', fmt="o", label='absent links',ecolor="grey",markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
@@ -173,18 +175,18 @@ ax.text(1,0.32,"Mean Absolute Error %.3f%%"%mrse,
 ### LAGGED LINKS
 print("Lagged only")
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_laggedmask[true_links_laggedmask==''] == averaged_boot_linkfreq_laggedmask[true_links_laggedmask=='']).sum()
-n_cross_line_absent_links = cross_line_func(x=true_link_freq_laggedmask[true_links_laggedmask==''], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask==''], 
-                xerr= true_freq_boot_std[true_links_laggedmask==''], yerr=std_boot_linkfreq[true_links_laggedmask=='']).sum()
-n_absent_links = (true_link_freq_laggedmask[true_links_laggedmask=='']).count()
-mrse = dist_func(true_link_freq_laggedmask[true_links_laggedmask==''],averaged_boot_linkfreq_laggedmask[true_links_laggedmask=='']).mean()
+n_same_freq = (true_link_freq_laggedmask[true_links_laggedmask==0] == averaged_boot_linkfreq_laggedmask[true_links_laggedmask==0]).sum()
+n_cross_line_absent_links = cross_line_func(x=true_link_freq_laggedmask[true_links_laggedmask==0], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask==0], 
+                xerr= true_freq_boot_std[true_links_laggedmask==0], yerr=std_boot_linkfreq[true_links_laggedmask==0]).sum()
+n_absent_links = (true_link_freq_laggedmask[true_links_laggedmask==0]).count()
+mrse = dist_func(true_link_freq_laggedmask[true_links_laggedmask==0],averaged_boot_linkfreq_laggedmask[true_links_laggedmask==0]).mean()
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,100*n_same_freq/n_absent_links))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_absent_links/n_absent_links))
 print("Frequency of points crossing the x=y line (removing same freq. edge): %.2f %%"%(100*(n_cross_line_absent_links-n_same_freq)/(n_absent_links-n_same_freq)))
 
 ax = fig.add_subplot(233)
-ax.errorbar(x=true_link_freq_laggedmask[true_links_laggedmask==''], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask==''], 
-            xerr= true_freq_boot_std[true_links_laggedmask==''], yerr=std_boot_linkfreq[true_links_laggedmask==''],
+ax.errorbar(x=true_link_freq_laggedmask[true_links_laggedmask==0], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask==0], 
+            xerr= true_freq_boot_std[true_links_laggedmask==0], yerr=std_boot_linkfreq[true_links_laggedmask==0],
     color='orange', fmt="o", label='absent links',ecolor='grey',markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
@@ -203,18 +205,18 @@ ax.text(1,0.32,"Mean Absolute Error %.3f%%"%mrse,
 ######## Existing links plot
 print("Existing links")
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_anymask[true_links_anymask!=''] == averaged_boot_linkfreq_anymask[true_links_anymask!='']).sum()
-n_cross_line_existing_links = cross_line_func(x=true_link_freq_anymask[true_links_anymask!=''], y=averaged_boot_linkfreq_anymask[true_links_anymask!=''], 
-                xerr= true_freq_boot_std[true_links_anymask!=''], yerr=std_boot_linkfreq[true_links_anymask!='']).sum()
-n_present_links = true_link_freq_anymask[true_links_anymask!=''].count()
-mrse = dist_func(true_link_freq_anymask[true_links_anymask!=''],averaged_boot_linkfreq_anymask[true_links_anymask!='']).mean()
+n_same_freq = (true_link_freq_anymask[true_links_anymask!=0] == averaged_boot_linkfreq_anymask[true_links_anymask!=0]).sum()
+n_cross_line_existing_links = cross_line_func(x=true_link_freq_anymask[true_links_anymask!=0], y=averaged_boot_linkfreq_anymask[true_links_anymask!=0], 
+                xerr= true_freq_boot_std[true_links_anymask!=0], yerr=std_boot_linkfreq[true_links_anymask!=0]).sum()
+n_present_links = true_link_freq_anymask[true_links_anymask!=0].count()
+mrse = dist_func(true_link_freq_anymask[true_links_anymask!=0],averaged_boot_linkfreq_anymask[true_links_anymask!=0]).mean()
 print(n_present_links)
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,100*n_same_freq/n_present_links))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_existing_links/n_present_links))
 print("Frequency of points crossing the x=y line (removing same freq. edge): %.2f %%"%(100*(n_cross_line_existing_links-n_same_freq)/(n_present_links-n_same_freq)))
 
 ax = fig.add_subplot(234)
-ax.errorbar(x=true_link_freq_anymask[true_links_anymask!=''], y=averaged_boot_linkfreq_anymask[true_links_anymask!=''], xerr= true_freq_boot_std[true_links_anymask!=''],yerr=std_boot_linkfreq[true_links_anymask!=''],
+ax.errorbar(x=true_link_freq_anymask[true_links_anymask!=0], y=averaged_boot_linkfreq_anymask[true_links_anymask!=0], xerr= true_freq_boot_std[true_links_anymask!=0],yerr=std_boot_linkfreq[true_links_anymask!=0],
     color='orange',  fmt="o", label='existing links',ecolor='grey',markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
@@ -233,18 +235,18 @@ ax.text(1,0.32,"Mean Absolute Error %.3f%%"%mrse,
 ###Contemp links
 print("Contemporaneous only")
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_contempmask[true_links_contempmask!=''] == averaged_boot_linkfreq_contempmask[true_links_contempmask!='']).sum()
-n_cross_line_existing_links = cross_line_func(x=true_link_freq_contempmask[true_links_contempmask!=''], y=averaged_boot_linkfreq_contempmask[true_links_contempmask!=''], 
-                xerr= true_freq_boot_std[true_links_contempmask!=''], yerr=std_boot_linkfreq[true_links_contempmask!='']).sum()
-n_present_links = (true_link_freq_contempmask[true_links_contempmask!='']).count()
-mrse = dist_func(true_link_freq_contempmask[true_links_contempmask!=''],averaged_boot_linkfreq_contempmask[true_links_contempmask!='']).mean()
+n_same_freq = (true_link_freq_contempmask[true_links_contempmask!=0] == averaged_boot_linkfreq_contempmask[true_links_contempmask!=0]).sum()
+n_cross_line_existing_links = cross_line_func(x=true_link_freq_contempmask[true_links_contempmask!=0], y=averaged_boot_linkfreq_contempmask[true_links_contempmask!=0], 
+                xerr= true_freq_boot_std[true_links_contempmask!=0], yerr=std_boot_linkfreq[true_links_contempmask!=0]).sum()
+n_present_links = (true_link_freq_contempmask[true_links_contempmask!=0]).count()
+mrse = dist_func(true_link_freq_contempmask[true_links_contempmask!=0],averaged_boot_linkfreq_contempmask[true_links_contempmask!=0]).mean()
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,100*n_same_freq/n_present_links))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_existing_links/n_present_links))
 print("Frequency of points crossing the x=y line (removing same freq. edge): %.2f %%"%(100*(n_cross_line_existing_links-n_same_freq)/(n_present_links-n_same_freq)))
 
 ax = fig.add_subplot(235)
-ax.errorbar(x=true_link_freq_contempmask[true_links_contempmask!=''], y=averaged_boot_linkfreq_contempmask[true_links_contempmask!=''], 
-            xerr= true_freq_boot_std[true_links_contempmask!=''],yerr=std_boot_linkfreq[true_links_contempmask!=''],
+ax.errorbar(x=true_link_freq_contempmask[true_links_contempmask!=0], y=averaged_boot_linkfreq_contempmask[true_links_contempmask!=0], 
+            xerr= true_freq_boot_std[true_links_contempmask!=0],yerr=std_boot_linkfreq[true_links_contempmask!=0],
     color='orange',  fmt="o", label='existing links',ecolor='grey',markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
@@ -264,18 +266,18 @@ ax.text(1,0.32,"Mean Absolute Error %.3f%%"%mrse,
 ### LAGGED LINKS
 print("Lagged only")
 #Frequency of points where the uncertainty bars cross x=y line
-n_same_freq = (true_link_freq_laggedmask[true_links_laggedmask!=''] == averaged_boot_linkfreq_laggedmask[true_links_laggedmask!='']).sum()
-n_cross_line_existing_links = cross_line_func(x=true_link_freq_laggedmask[true_links_laggedmask!=''], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=''], 
-                xerr= true_freq_boot_std[true_links_laggedmask!=''], yerr=std_boot_linkfreq[true_links_laggedmask!='']).sum()
-n_present_links = (true_link_freq_laggedmask[true_links_laggedmask!='']).count()
-mrse = dist_func(true_link_freq_laggedmask[true_links_laggedmask!=''],averaged_boot_linkfreq_laggedmask[true_links_laggedmask!='']).mean()
+n_same_freq = (true_link_freq_laggedmask[true_links_laggedmask!=0] == averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=0]).sum()
+n_cross_line_existing_links = cross_line_func(x=true_link_freq_laggedmask[true_links_laggedmask!=0], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=0], 
+                xerr= true_freq_boot_std[true_links_laggedmask!=0], yerr=std_boot_linkfreq[true_links_laggedmask!=0]).sum()
+n_present_links = (true_link_freq_laggedmask[true_links_laggedmask!=0]).count()
+mrse = dist_func(true_link_freq_laggedmask[true_links_laggedmask!=0],averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=0]).mean()
 print("Number of edges with same frequency (1.): %d (%.2f %%)" %(n_same_freq,100*n_same_freq/n_present_links))
 print("Frequency of points crossing the x=y line: %.2f %%" %(100*n_cross_line_existing_links/n_present_links))
 print("Frequency of points crossing the x=y line (removing same freq. edge): %.2f %%"%(100*(n_cross_line_existing_links-n_same_freq)/(n_present_links-n_same_freq)))
 
 ax = fig.add_subplot(236)
-ax.errorbar(x=true_link_freq_laggedmask[true_links_laggedmask!=''], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=''], 
-            xerr= true_freq_boot_std[true_links_laggedmask!=''],yerr=std_boot_linkfreq[true_links_laggedmask!=''],
+ax.errorbar(x=true_link_freq_laggedmask[true_links_laggedmask!=0], y=averaged_boot_linkfreq_laggedmask[true_links_laggedmask!=0], 
+            xerr= true_freq_boot_std[true_links_laggedmask!=0],yerr=std_boot_linkfreq[true_links_laggedmask!=0],
     color='orange',  fmt="o", label='existing links',ecolor='grey',markersize=0.8,elinewidth=0.5)
 ax.plot(np.linspace(0.2, 1), np.linspace(0.2, 1), color='black')
 ax.legend()
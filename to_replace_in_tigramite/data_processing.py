@@ -62,6 +62,11 @@ class DataFrame():
     remove_missing_upto_maxlag : bool, optional (default: False)
         Whether to remove not only missing samples, but also all neighboring
         samples up to max_lag (as given by cut_off in construct_array).
+    lag_embedding : bool, optional (default: False)
+        Whether to build a strided lag-embedded view of shape
+        (T - tau_max, N, tau_max + 1) of each dataset (and of the masks) once
+        per tau_max. construct_array then gathers all rows of XYZ in a single
+        vectorized take instead of one indexing operation per (var, lag).
     analysis_mode : string, optional (default: 'single')
         Must be 'single' or 'multiple'.
         Determines whether data contains a single (potentially multivariate)
@@ -153,12 +158,18 @@ class DataFrame():
         observation exists in the dataset.
     self.bootstrap : dictionary
         Whether to use bootstrap. Must be a dictionary with keys random_state,
-        boot_samples, and boot_blocklength.
+        boot_samples, and boot_blocklength, and optionally boot_method
+        ('block', 'circular', 'stationary', 'subsample', or 'datasets') and
+        boot_fraction, see _get_bootstrap_draw and _get_dataset_draw.
+        During PCMCI.run_bootstrap_of it also holds the seed boot_seed of the
+        current replicate.
+    self.lag_embedding : bool
+        Is lag_embedding
     """
 
     def __init__(self, data, mask=None, missing_flag=None, vector_vars=None, var_names=None,
         type_mask=None, datatime=None, analysis_mode ='single', reference_points=None,
-        time_offsets=None, remove_missing_upto_maxlag=False):
+        time_offsets=None, remove_missing_upto_maxlag=False, lag_embedding=False):
 
         # Check that a valid analysis mode, specified by the argument
         # 'analysis_mode', has been chosen
@@ -356,6 +367,17 @@ class DataFrame():
         # If PCMCI.run_bootstrap_of is called, then the
         # bootstrap random draw can be set here
         self.bootstrap = None
+        # Bootstrap draws of the current replicate, see _get_bootstrap_draw
+        self._bootstrap_cache = {}
+        # All datasets, each drawn once, see _get_dataset_draw
+        self._all_datasets = [(dataset_key, 1) for dataset_key in self.values]
+        # Block lengths from the autocorrelation of the datasets, see
+        # _get_autocorrelation_block_length
+        self._block_lengths = {}
+
+        # Lag-embedded views of the data and masks, see _get_lag_embedding
+        self.lag_embedding = lag_embedding
+        self._lag_embeddings = {}
 
 
     def _check_mask(self, mask, check_type_mask=False):
@@ -732,95 +754,47 @@ class DataFrame():
         type_masks = dict()
         self.use_indices_dataset_dict = dict()
 
-        for dataset_key, dataset_data in self.values.items():
+        # Datasets in the current bootstrap draw and their multiplicities
+        dataset_draw = self._get_dataset_draw()
+
+        for dataset_key, n_draws in dataset_draw:
+            dataset_data = self.values[dataset_key]
 
-            # Apply time offset to the reference points
-            ref_points_here = self.reference_points - self.time_offsets[dataset_key]
-
-            # Remove reference points that are out of bounds or are to be
-            # excluded given the choice of 'cut_off'
-            ref_points_here = ref_points_here[ref_points_here >= max_lag]
-            ref_points_here = ref_points_here[ref_points_here < self.T[dataset_key]]
-
-            # Keep track of which reference points would have remained for
-            # max_lag == 2*tau_max
-            if cut_off == '2xtau_max_future':
-                ref_points_here_2_tau_max = self.reference_points - self.time_offsets[dataset_key]
-                ref_points_here_2_tau_max = ref_points_here_2_tau_max[ref_points_here_2_tau_max  >= 2*tau_max]
-                ref_points_here_2_tau_max = ref_points_here_2_tau_max[ref_points_here_2_tau_max  < self.T[dataset_key]]
-
-            # Sort the valid reference points (not needed, but might be useful
-            # for detailed debugging)
-            ref_points_here = np.sort(ref_points_here)
-
-            # For cut_off == '2xtau_max_future' reduce the samples size the
-            # number of samples that would have been obtained for cut_off ==
-            # '2xtau_max', removing the temporally latest ones
-            if cut_off == '2xtau_max_future':
-                n_to_cut_off = len(ref_points_here) - len(ref_points_here_2_tau_max)
-                assert n_to_cut_off >= 0
-                if n_to_cut_off > 0:
-                    ref_points_here = np.sort(ref_points_here)
-                    ref_points_here = ref_points_here[:-n_to_cut_off]
+            # Get the valid reference points of this dataset
+            ref_points_here = self._get_reference_points(dataset_key,
+                                                         max_lag, cut_off,
+                                                         tau_max)
 
             # If no valid reference points are left, continue with the next dataset
             if len(ref_points_here) == 0:
                 continue
 
-            if self.bootstrap is not None:
-
-                boot_blocklength = self.bootstrap['boot_blocklength']
-
-                if boot_blocklength == 'cube_root':
-                    boot_blocklength = max(1, int(len(ref_points_here)**(1/3)))
-
-                elif type(boot_blocklength) is int and boot_blocklength > 0:
-                    pass
-                else:
-                    raise ValueError("boot_blocklength must be integer > 0, 'cube_root', or 'from_autocorrelation'")
-
-                # Chooses THE SAME random seed for every dataset, maybe that's what we want...
-
-                random_state = deepcopy(self.bootstrap['random_state'])
-
-                # Determine the number of blocks total, rounding up for non-integer
-                # amounts
-                n_blks = int(math.ceil(float(len(ref_points_here))/boot_blocklength))
-
-                if n_blks < 10:
-                    raise ValueError("Only %d block(s) for block-sampling,"  %n_blks +
-                                     "choose smaller boot_blocklength!")
-
-                # Get the starting indices for the blocks
-                blk_strt = random_state.choice(np.arange(len(ref_points_here) - boot_blocklength), size=n_blks, replace=True)
-                # Get the empty array of block resampled values
-                boot_draw = np.zeros(n_blks*boot_blocklength, dtype='int')
-                # Fill the array of block resamples
-                for i in range(boot_blocklength):
-                    boot_draw[i::boot_blocklength] = ref_points_here[blk_strt + i]
-                # Cut to proper length
-                ref_points_here = boot_draw[:len(ref_points_here)]
+            if dataset_draw is self._all_datasets and self.bootstrap is not None:
+                ref_points_here = self._get_bootstrap_draw(ref_points_here,
+                                    draw_key=(dataset_key, max_lag, cut_off, tau_max))
 
             # Construct the data array holding the samples taken from the
             # current dataset
-            samples_datasets[dataset_key] = np.zeros((dim, len(ref_points_here)), dtype = dataset_data.dtype)
-            for i, (var, lag) in enumerate(XYZ):
-                samples_datasets[dataset_key][i, :] = dataset_data[ref_points_here + lag, var]
+            samples_datasets[dataset_key] = self._get_lagged_samples('values',
+                                    dataset_data, dataset_key, ref_points_here,
+                                    XYZ, tau_max, dtype=dataset_data.dtype)
 
             # Build the mask array corresponding to this dataset
             if _mask is not None:
-                mask_dataset = np.zeros((dim, len(ref_points_here)), dtype = 'bool')
-                for i, (var, lag) in enumerate(XYZ):
-                    mask_dataset[i, :] = _mask[dataset_key][ref_points_here + lag, var]
+                mask_dataset = self._get_lagged_samples(
+                                    'mask' if _mask is self.mask else None,
+                                    _mask[dataset_key], dataset_key,
+                                    ref_points_here, XYZ, tau_max, dtype='bool')
 
             # Take care of masking
             use_indices_dataset = np.ones(len(ref_points_here), dtype = 'int')
 
             # Build the type mask array corresponding to this dataset
             if _type_mask is not None:
-                type_mask_dataset = np.zeros((dim, len(ref_points_here)), dtype = 'bool')
-                for i, (var, lag) in enumerate(XYZ):
-                    type_mask_dataset[i, :] = _type_mask[dataset_key][ref_points_here + lag, var]
+                type_mask_dataset = self._get_lagged_samples(
+                                    'type_mask' if _type_mask is self.type_mask else None,
+                                    _type_mask[dataset_key], dataset_key,
+                                    ref_points_here, XYZ, tau_max, dtype='bool')
                 type_masks[dataset_key] = type_mask_dataset
             
             # Remove all values that have missing value flag, and optionally as well the time
@@ -854,7 +828,15 @@ class DataFrame():
             # Accordingly update the data array
             samples_datasets[dataset_key] = samples_datasets[dataset_key][:, use_indices_dataset == 1]
 
-        ## end for dataset_key, dataset_data in self.values.items()
+            # Repeat datasets drawn several times by the bootstrap
+            if n_draws > 1:
+                samples_datasets[dataset_key] = np.tile(
+                                samples_datasets[dataset_key], (1, n_draws))
+                if _type_mask is not None:
+                    type_masks[dataset_key] = np.tile(type_masks[dataset_key],
+                                                      (1, n_draws))
+
+        ## end for dataset_key, n_draws in dataset_draw
 
         # Save used indices as attribute
         if len(ref_points_here) > 0:
@@ -886,6 +868,426 @@ class DataFrame():
 
         return array, xyz, type_array
 
+    def _get_reference_points(self, dataset_key, max_lag, cut_off, tau_max):
+        """Returns the valid reference points of one dataset.
+
+        Parameters
+        ----------
+        dataset_key : key
+            Dataset identifier as in self.values.
+        max_lag : int
+            Number of samples cut off at the beginning, as determined by
+            cut_off in construct_array.
+        cut_off : string
+            See construct_array.
+        tau_max : int
+            Maximum time lag.
+
+        Returns
+        -------
+        ref_points_here : array of ints
+            Sorted reference points relative to the time axis of the dataset.
+        """
+        # Apply time offset to the reference points
+        ref_points_here = self.reference_points - self.time_offsets[dataset_key]
+
+        # Remove reference points that are out of bounds or are to be
+        # excluded given the choice of 'cut_off'
+        ref_points_here = ref_points_here[ref_points_here >= max_lag]
+        ref_points_here = ref_points_here[ref_points_here < self.T[dataset_key]]
+
+        # Keep track of which reference points would have remained for
+        # max_lag == 2*tau_max
+        if cut_off == '2xtau_max_future':
+            ref_points_here_2_tau_max = self.reference_points - self.time_offsets[dataset_key]
+            ref_points_here_2_tau_max = ref_points_here_2_tau_max[ref_points_here_2_tau_max  >= 2*tau_max]
+            ref_points_here_2_tau_max = ref_points_here_2_tau_max[ref_points_here_2_tau_max  < self.T[dataset_key]]
+
+        # Sort the valid reference points (not needed, but might be useful
+        # for detailed debugging)
+        ref_points_here = np.sort(ref_points_here)
+
+        # For cut_off == '2xtau_max_future' reduce the samples size the
+        # number of samples that would have been obtained for cut_off ==
+        # '2xtau_max', removing the temporally latest ones
+        if cut_off == '2xtau_max_future':
+            n_to_cut_off = len(ref_points_here) - len(ref_points_here_2_tau_max)
+            assert n_to_cut_off >= 0
+            if n_to_cut_off > 0:
+                ref_points_here = np.sort(ref_points_here)
+                ref_points_here = ref_points_here[:-n_to_cut_off]
+
+        return ref_points_here
+
+    def construct_reference_points(self, tau_max, cut_off='2xtau_max',
+                                   return_counts=False):
+        """Returns the reference points used by construct_array.
+
+        If self.bootstrap is set, the reference points are those of the
+        current bootstrap draw, exactly as used in construct_array. Only cut
+        offs that do not depend on X, Y, Z are supported.
+
+        Parameters
+        ----------
+        tau_max : int
+            Maximum time lag.
+        cut_off : {'2xtau_max', 'tau_max'}
+            See construct_array.
+        return_counts : bool, optional (default: False)
+            Whether to return the draw as unique reference points and their
+            multiplicities. Weighted statistics computed from these agree
+            with those of the full draw, but avoid the duplicated samples of
+            a draw with replacement.
+
+        Returns
+        -------
+        ref_points : dictionary
+            Dictionary {dataset_key: reference points} of all datasets with
+            at least one valid reference point. If return_counts is True, the
+            values are tuples (unique reference points, counts).
+        """
+        if cut_off == '2xtau_max':
+            max_lag = 2*tau_max
+        elif cut_off == 'tau_max':
+            max_lag = tau_max
+        else:
+            raise ValueError("cut_off must be in {'2xtau_max', 'tau_max'}")
+
+        ref_points = dict()
+        dataset_draw = self._get_dataset_draw()
+        for dataset_key, n_draws in dataset_draw:
+            ref_points_here = self._get_reference_points(dataset_key,
+                                                         max_lag, cut_off,
+                                                         tau_max)
+            if len(ref_points_here) == 0:
+                continue
+            if dataset_draw is self._all_datasets and self.bootstrap is not None:
+                ref_points_here = self._get_bootstrap_draw(ref_points_here,
+                                    draw_key=(dataset_key, max_lag, cut_off, tau_max))
+            if return_counts:
+                unique, counts = np.unique(ref_points_here, return_counts=True)
+                ref_points_here = (unique, n_draws * counts)
+            elif n_draws > 1:
+                ref_points_here = np.tile(ref_points_here, n_draws)
+            ref_points[dataset_key] = ref_points_here
+
+        return ref_points
+
+    def _get_dataset_draw(self):
+        """Returns the datasets of the current bootstrap draw.
+
+        With self.bootstrap['boot_method'] == 'datasets', whole datasets are
+        resampled with replacement, e.g., the members of an ensemble, while
+        the time points within every dataset are kept. The draw is computed
+        once per bootstrap replicate and cached like the draws of
+        _get_bootstrap_draw. Otherwise, all datasets are returned once.
+
+        Returns
+        -------
+        dataset_draw : list of tuples
+            List [(dataset_key, n_draws), ...] of the drawn datasets and how
+            often each of them was drawn, in the order of self.values. It is
+            self._all_datasets if the datasets are not resampled.
+        """
+        if (self.bootstrap is None
+                or self.bootstrap.get('boot_method', 'block') != 'datasets'):
+            return self._all_datasets
+
+        if self.analysis_mode != 'multiple':
+            raise ValueError("boot_method 'datasets' requires "
+                             "analysis_mode='multiple'.")
+
+        random_state = self.bootstrap['random_state']
+        cache = self._bootstrap_cache
+        if (cache.get('random_state') is not random_state
+                or cache.get('reference_points') is not self.reference_points):
+            cache = self._bootstrap_cache = {'random_state': random_state,
+                                    'reference_points': self.reference_points,
+                                    'draws': {}}
+        if 'datasets' not in cache:
+            # Same seed as the draws of the reference points
+            random_state = deepcopy(random_state)
+            n_draws = np.bincount(random_state.choice(self.M, size=self.M,
+                                                      replace=True),
+                                  minlength=self.M)
+            cache['datasets'] = [(dataset_key, int(n_draws[m]))
+                                 for m, dataset_key in enumerate(self.values)
+                                 if n_draws[m] > 0]
+        return cache['datasets']
+
+    def _get_bootstrap_draw(self, ref_points_here, draw_key):
+        """Returns the block-bootstrap draw of the reference points.
+
+        The draw only depends on self.bootstrap and on ref_points_here, which
+        in turn is fixed by draw_key and self.reference_points. It is
+        therefore computed once per bootstrap replicate and cached until
+        either the random state of the replicate or the reference points are
+        replaced.
+
+        Depending on self.bootstrap['boot_method'], the draw is
+
+        - 'block' (default): blocks of boot_blocklength drawn with
+          replacement until the draw has the length of ref_points_here,
+        - 'circular': as 'block', but blocks may start anywhere and wrap
+          around from the last to the first reference point, so that every
+          reference point is drawn with the same probability,
+        - 'stationary': as 'circular', but with geometrically distributed
+          block lengths of mean boot_blocklength (Politis & Romano, 1994),
+          so that the resampled series is stationary,
+        - 'subsample': a fraction self.bootstrap['boot_fraction'] of
+          ref_points_here drawn as consecutive blocks without replacement,
+          so the draw is shorter and has no duplicates.
+
+        With boot_blocklength='from_autocorrelation', the block length is
+        estimated once per dataset with get_block_length, see
+        _get_autocorrelation_block_length.
+
+        Parameters
+        ----------
+        ref_points_here : array of ints
+            Sorted valid reference points of one dataset.
+        draw_key : tuple
+            Tuple (dataset_key, max_lag, cut_off, tau_max) that determines
+            ref_points_here.
+
+        Returns
+        -------
+        boot_draw : array of ints
+            Resampled reference points.
+        """
+        random_state = self.bootstrap['random_state']
+        cache = self._bootstrap_cache
+        if (cache.get('random_state') is not random_state
+                or cache.get('reference_points') is not self.reference_points):
+            cache = self._bootstrap_cache = {'random_state': random_state,
+                                    'reference_points': self.reference_points,
+                                    'draws': {}}
+
+        boot_blocklength = self.bootstrap['boot_blocklength']
+        boot_method = self.bootstrap.get('boot_method', 'block')
+        boot_fraction = self.bootstrap.get('boot_fraction', 1.)
+        dataset_key = draw_key[0]
+        draw_key = draw_key + (boot_blocklength, boot_method, boot_fraction)
+        if draw_key in cache['draws']:
+            return cache['draws'][draw_key]
+
+        n_points = len(ref_points_here)
+        if boot_method == 'subsample':
+            if not 0. < boot_fraction <= 1.:
+                raise ValueError("boot_fraction must be in (0, 1].")
+            n_samples = int(round(boot_fraction*n_points))
+        elif boot_method in ['block', 'circular', 'stationary']:
+            n_samples = n_points
+        else:
+            raise ValueError("boot_method must be 'block', 'circular', "
+                             "'stationary', or 'subsample'.")
+
+        if boot_blocklength == 'cube_root':
+            boot_blocklength = max(1, int(n_points**(1/3)))
+        elif boot_blocklength == 'from_autocorrelation':
+            # Limit the estimate such that the draw has at least 10 blocks
+            boot_blocklength = max(1, min(
+                self._get_autocorrelation_block_length(dataset_key),
+                n_samples // 10))
+        elif type(boot_blocklength) is int and boot_blocklength > 0:
+            pass
+        else:
+            raise ValueError("boot_blocklength must be integer > 0, 'cube_root', or 'from_autocorrelation'")
+
+        # Chooses THE SAME random seed for every dataset, maybe that's what we want...
+
+        random_state = deepcopy(random_state)
+
+        if boot_method == 'block':
+            # Determine the number of blocks total, rounding up for non-integer
+            # amounts
+            n_blks = int(math.ceil(float(n_points)/boot_blocklength))
+
+            if n_blks < 10:
+                raise ValueError("Only %d block(s) for block-sampling,"  %n_blks +
+                                 "choose smaller boot_blocklength!")
+
+            # Get the starting indices for the blocks
+            blk_strt = random_state.choice(np.arange(n_points - boot_blocklength), size=n_blks, replace=True)
+            # Get the empty array of block resampled values
+            boot_draw = np.zeros(n_blks*boot_blocklength, dtype='int')
+            # Fill the array of block resamples
+            for i in range(boot_blocklength):
+                boot_draw[i::boot_blocklength] = ref_points_here[blk_strt + i]
+            # Cut to proper length
+            boot_draw = boot_draw[:n_points]
+
+        elif boot_method == 'circular':
+            n_blks = int(math.ceil(float(n_points)/boot_blocklength))
+
+            if n_blks < 10:
+                raise ValueError("Only %d block(s) for block-sampling,"  %n_blks +
+                                 "choose smaller boot_blocklength!")
+
+            # Blocks start anywhere and wrap around the end
+            blk_strt = random_state.choice(n_points, size=n_blks, replace=True)
+            boot_draw = ref_points_here[(blk_strt[:, None]
+                        + np.arange(boot_blocklength)).ravel() % n_points]
+            # Cut to proper length
+            boot_draw = boot_draw[:n_points]
+
+        elif boot_method == 'stationary':
+            if n_points < 10*boot_blocklength:
+                raise ValueError("Only %.1f block(s) on average for "
+                                 "block-sampling," % (
+                                 float(n_points)/boot_blocklength) +
+                                 "choose smaller boot_blocklength!")
+
+            # Every sample starts a new block with probability
+            # 1/boot_blocklength at a random start, otherwise it continues
+            # the block of the previous sample
+            pnt_strt = random_state.choice(n_points, size=n_points,
+                                           replace=True)
+            new_blk = random_state.uniform(size=n_points) < 1./boot_blocklength
+            new_blk[0] = True
+            pos = np.arange(n_points)
+            blk_pos = np.maximum.accumulate(np.where(new_blk, pos, 0))
+            boot_draw = ref_points_here[(pnt_strt[blk_pos] + pos - blk_pos)
+                                        % n_points]
+
+        else:
+            # Draw the blocks without replacement among the consecutive,
+            # non-overlapping blocks of ref_points_here
+            n_blks_total = n_points // boot_blocklength
+            n_blks = min(n_blks_total,
+                         int(math.ceil(float(n_samples)/boot_blocklength)))
+
+            if n_blks < 10:
+                raise ValueError("Only %d block(s) for subsampling,"  %n_blks +
+                                 "choose smaller boot_blocklength or larger "
+                                 "boot_fraction!")
+
+            # Sorted blocks keep the draw in time order
+            blk_strt = boot_blocklength * np.sort(random_state.choice(
+                                    n_blks_total, size=n_blks, replace=False))
+            boot_draw = ref_points_here[(blk_strt[:, None]
+                                + np.arange(boot_blocklength)).ravel()]
+            # Cut to proper length
+            boot_draw = boot_draw[:n_samples]
+
+        cache['draws'][draw_key] = boot_draw
+        return boot_draw
+
+    def _get_autocorrelation_block_length(self, dataset_key):
+        """Returns the block length of one dataset from its autocorrelation.
+
+        The block length is estimated with get_block_length jointly for all
+        variables, ignoring time steps with missing values. It only depends
+        on the data and is therefore cached until the dataset is replaced.
+
+        Parameters
+        ----------
+        dataset_key : int or string
+            Dataset identifier as in self.values.
+
+        Returns
+        -------
+        block_len : int
+            Block length for block-bootstrap.
+        """
+        data = self.values[dataset_key]
+        cached = self._block_lengths.get(dataset_key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        valid = np.isfinite(data).all(axis=1)
+        if self.mask is not None:
+            valid &= ~self.mask[dataset_key].any(axis=1)
+        array = data[valid].T
+        block_len = get_block_length(array,
+                                     xyz=np.zeros(len(array), dtype='int'),
+                                     mode='confidence')
+        self._block_lengths[dataset_key] = (data, block_len)
+        return block_len
+
+    def _get_lag_embedding(self, name, dataset_key, source, tau_max):
+        """Returns the lag-embedded view of one dataset.
+
+        The view is created with sliding_window_view and thus does not copy
+        source. Its entry [t - tau_max, var, tau] is source[t - tau, var].
+        Views are cached per (name, dataset_key, tau_max) and rebuilt if
+        source has been replaced.
+
+        Parameters
+        ----------
+        name : string
+            Name of the embedded array, e.g., 'values' or 'mask'.
+        dataset_key : key
+            Dataset identifier as in self.values.
+        source : array of shape (T, N)
+            Array to embed.
+        tau_max : int
+            Maximum time lag of the embedding.
+
+        Returns
+        -------
+        embedding : array of shape (T - tau_max, N, tau_max + 1)
+            Read-only lag-embedded view of source.
+        """
+        key = (name, dataset_key, tau_max)
+        cached = self._lag_embeddings.get(key)
+        if cached is not None and cached[0] is source:
+            return cached[1]
+
+        embedding = np.lib.stride_tricks.sliding_window_view(
+                            source, tau_max + 1, axis=0)[:, :, ::-1]
+        self._lag_embeddings[key] = (source, embedding)
+        return embedding
+
+    def _get_lagged_samples(self, name, source, dataset_key, ref_points_here,
+                            XYZ, tau_max, dtype):
+        """Returns the array of lagged samples of XYZ from one dataset.
+
+        If self.lag_embedding is True and name is not None, all rows are
+        gathered in one take from the lag-embedded view of source. Otherwise,
+        or if some lag exceeds tau_max or some reference point is smaller
+        than tau_max, the rows are filled one (var, lag) at a time.
+
+        Parameters
+        ----------
+        name : string or None
+            Name of the embedded array. None disables the embedding, e.g.,
+            for masks that are passed to construct_array directly.
+        source : array of shape (T, N)
+            Dataset to take the samples from.
+        dataset_key : key
+            Dataset identifier as in self.values.
+        ref_points_here : array of ints
+            Reference points of the samples.
+        XYZ : list of tuples
+            List of (var, lag) tuples.
+        tau_max : int
+            Maximum time lag.
+        dtype : data-type
+            Data type of the returned array.
+
+        Returns
+        -------
+        samples : array of shape (len(XYZ), len(ref_points_here))
+            Samples of source[ref_points_here + lag, var] for all XYZ.
+        """
+        xyz_array = np.array(XYZ, dtype='int').reshape(-1, 2)
+        variables, lags = xyz_array[:, 0], xyz_array[:, 1]
+
+        if (self.lag_embedding and name is not None and len(XYZ) > 0
+                and ref_points_here.min() >= tau_max
+                and lags.max() <= 0 and -lags.min() <= tau_max):
+            embedding = self._get_lag_embedding(name, dataset_key, source,
+                                                tau_max)
+            return embedding[ref_points_here[None, :] - tau_max,
+                             variables[:, None],
+                             -lags[:, None]].astype(dtype, copy=False)
+
+        samples = np.zeros((len(XYZ), len(ref_points_here)), dtype=dtype)
+        for i, (var, lag) in enumerate(XYZ):
+            samples[i, :] = source[ref_points_here + lag, var]
+        return samples
+
     def _check_nodes(self, Y, XYZ, N, dim):
         """
         Checks that:
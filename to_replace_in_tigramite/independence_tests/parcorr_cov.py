@@ -0,0 +1,487 @@
+"""To add to tigramite. Covariance-based partial correlation test for bootstrap aggregation"""
+# License: GNU General Public License v3.0
+
+from __future__ import print_function
+from collections import OrderedDict
+import numpy as np
+
+from .parcorr import ParCorr
+
+class ParCorrCov(ParCorr):
+    r"""Partial correlation test served from a lagged covariance matrix.
+
+    For linear partial correlation, all tests on the samples of one
+    dataframe (or one bootstrap replicate of it) can be answered from the
+    covariance matrix of the lag embedding
+
+    .. math::  (X^1_t, X^1_{t-1}, ..., X^1_{t-\tau_{\max}}, X^2_t, ...)
+
+    evaluated at the reference points returned by
+    dataframe.construct_reference_points(). A bootstrap draw enters as unique
+    reference points weighted by their multiplicities. This matrix of size
+    :math:`N(\tau_{\max}+1)` is built once and each test of
+    :math:`X \perp Y | Z` is then computed from the Schur complement of the
+    :math:`Z`-block, which is the covariance of the OLS residuals of ParCorr.
+    Value and analytic p-value therefore agree with ParCorr up to floating
+    point rounding.
+
+    Tests that cannot be served from the covariance matrix fall back to
+    ParCorr. These are tests with significance other than 'analytic',
+    masking, missing values, vector-valued variables, recycled residuals,
+    multivariate X or Y, cut_off other than '2xtau_max', or lags beyond
+    tau_max.
+
+    Parameters
+    ----------
+    **kwargs :
+        Arguments passed on to Parent class ParCorr.
+    """
+    def __init__(self, **kwargs):
+        ParCorr.__init__(self, **kwargs)
+        # Covariance matrix of the current samples, see _get_covariance
+        self._covariance_cache = {}
+        # Covariance matrices of a block of bootstrap replicates, see
+        # precompute_bootstrap
+        self._bootstrap_covariances = {}
+        # Sufficient statistics of the last samples, see _update_covariance
+        self._sufficient_statistics = {}
+
+    def _use_covariance(self, X, Y, Z, tau_max, cut_off):
+        """Returns whether the test can be served from the covariance matrix."""
+        dataframe = self.dataframe
+        if (self.significance != 'analytic' or self.recycle_residuals
+                or cut_off != '2xtau_max'
+                or self.mask_type is not None
+                or dataframe.missing_flag is not None):
+            return False
+
+        if any(dataframe.vector_vars[var] != [(var, 0)]
+               for var in dataframe.vector_vars):
+            return False
+
+        if len(X) != 1 or len(Y) != 1:
+            return False
+
+        return all(-tau_max <= lag <= 0 for (_, lag) in X + Y + Z)
+
+    def _get_covariance(self, tau_max):
+        """Returns the lagged covariance matrix of the current samples.
+
+        The matrix is cached until the bootstrap random state or the
+        reference points of the dataframe are replaced, i.e., it is computed
+        once per bootstrap replicate or sliding window. For overlapping
+        windows it is updated from the previous window, see
+        _update_covariance.
+
+        Parameters
+        ----------
+        tau_max : int
+            Maximum time lag.
+
+        Returns
+        -------
+        cov : array of shape (N*(tau_max+1), N*(tau_max+1))
+            Covariance matrix, where (var, -tau) has index
+            var*(tau_max+1) + tau.
+        T : int
+            Number of samples.
+        """
+        dataframe = self.dataframe
+        random_state = None
+        if dataframe.bootstrap is not None:
+            random_state = dataframe.bootstrap['random_state']
+
+        cache = self._covariance_cache
+        if (cache.get('dataframe') is not dataframe
+                or cache.get('random_state') is not random_state
+                or cache.get('reference_points') is not dataframe.reference_points):
+            cache = self._covariance_cache = {'dataframe': dataframe,
+                                    'random_state': random_state,
+                                    'reference_points': dataframe.reference_points,
+                                    'covariances': {}}
+
+        if tau_max in cache['covariances']:
+            return cache['covariances'][tau_max]
+
+        precomputed = self._get_precomputed_covariance(tau_max)
+        if precomputed is not None:
+            cache['covariances'][tau_max] = precomputed
+            return precomputed
+
+        # A bootstrap draw is taken as unique reference points weighted by
+        # their multiplicities, which avoids building duplicated samples
+        ref_points = dataframe.construct_reference_points(tau_max,
+                                                          cut_off='2xtau_max',
+                                                          return_counts=True)
+        counts = {dataset_key: np.bincount(ref_points_here, weights=weights,
+                                           minlength=dataframe.T[dataset_key])
+                  for dataset_key, (ref_points_here, weights)
+                  in ref_points.items()}
+
+        cov, T = self._update_covariance(counts, tau_max)
+        if cov is None:
+            samples = self._get_lagged_samples(
+                            {dataset_key: ref_points_here for dataset_key,
+                             (ref_points_here, _) in ref_points.items()}, tau_max)
+            weights = np.concatenate([weights for (_, weights)
+                                      in ref_points.values()])
+
+            T = int(weights.sum())
+            mean = np.dot(weights, samples) / T
+            samples = samples - mean
+            cov = np.dot(samples.T * weights, samples) / T
+
+            # Keep the sufficient statistics of these samples, shifted by
+            # their mean, for updates to overlapping samples
+            self._sufficient_statistics = {'dataframe': dataframe,
+                                    'tau_max': tau_max,
+                                    'counts': counts,
+                                    'shift': mean,
+                                    'sum': np.zeros(len(mean)),
+                                    'outer': T * cov,
+                                    'T': T}
+
+        cache['covariances'][tau_max] = (cov, T)
+        return cov, T
+
+    def _update_covariance(self, counts, tau_max):
+        """Returns the covariance matrix from updated sufficient statistics.
+
+        The weighted sums of the lag-embedded samples and of their outer
+        products are kept from the previous call. If the new samples differ
+        from those in fewer than half of the reference points, as for
+        overlapping sliding windows, only the entering and leaving samples
+        are added and subtracted, so that the cost scales with the window
+        step instead of the window length. The result agrees with a full
+        computation up to floating point rounding.
+
+        Parameters
+        ----------
+        counts : dictionary
+            Dictionary {dataset_key: counts} of the multiplicity of every
+            time step of each dataset in the new samples.
+        tau_max : int
+            Maximum time lag.
+
+        Returns
+        -------
+        cov, T : array and int, or None, None
+            Covariance matrix and number of samples, or None if a full
+            computation is cheaper.
+        """
+        dataframe = self.dataframe
+        stats = self._sufficient_statistics
+        if stats.get('dataframe') is not dataframe or stats.get('tau_max') != tau_max:
+            return None, None
+
+        changes = {}
+        for dataset_key in set(counts) | set(stats['counts']):
+            no_counts = np.zeros(dataframe.T[dataset_key])
+            changes[dataset_key] = (counts.get(dataset_key, no_counts)
+                                    - stats['counts'].get(dataset_key, no_counts))
+        n_changed = sum(np.count_nonzero(change) for change in changes.values())
+        n_samples = sum(np.count_nonzero(counts_here) for counts_here in counts.values())
+        if n_changed == 0 or 2 * n_changed >= n_samples:
+            return None, None
+
+        for dataset_key, change in changes.items():
+            time_steps = np.flatnonzero(change)
+            if len(time_steps) == 0:
+                continue
+            samples = self._get_lagged_samples({dataset_key: time_steps},
+                                               tau_max) - stats['shift']
+            weights = change[time_steps]
+            stats['sum'] += np.dot(weights, samples)
+            stats['outer'] += np.dot(samples.T * weights, samples)
+            stats['T'] += int(weights.sum())
+        stats['counts'] = counts
+
+        T = stats['T']
+        mean = stats['sum'] / T
+        cov = stats['outer'] / T - np.outer(mean, mean)
+        return cov, T
+
+    def _get_lagged_samples(self, ref_points, tau_max):
+        """Returns the lag-embedded samples at the given reference points.
+
+        Parameters
+        ----------
+        ref_points : dictionary
+            Dictionary {dataset_key: reference points}.
+        tau_max : int
+            Maximum time lag.
+
+        Returns
+        -------
+        samples : array of shape (n_samples, N*(tau_max+1))
+            Samples of all datasets, concatenated in the order of ref_points.
+        """
+        dataframe = self.dataframe
+        samples = []
+        for dataset_key, ref_points_here in ref_points.items():
+            dataset_data = dataframe.values[dataset_key]
+            embedding = dataframe._get_lag_embedding('values', dataset_key,
+                                                     dataset_data, tau_max)
+            samples.append(embedding[ref_points_here - tau_max].reshape(
+                                        len(ref_points_here), -1))
+        return np.concatenate(samples, axis=0)
+
+    def precompute_bootstrap(self, boot_seeds, tau_max):
+        """Prepares the covariance matrices of many bootstrap replicates.
+
+        Called by PCMCI.run_bootstrap_of before the replicates of boot_seeds
+        are run. The lagged samples at the valid reference points are built
+        once for all replicates. The covariance matrices are computed when
+        _get_covariance first asks for one of them, for a block of
+        consecutive replicates at once: their draws are expressed as a matrix
+        of counts over the valid reference points, and the covariance
+        matrices are obtained from it in batched matrix products instead of
+        one product per replicate. Only the matrices of the current block are
+        kept, so memory does not grow with the number of replicates, and
+        replicates that are never run (e.g., after early stopping) are never
+        computed.
+
+        Parameters
+        ----------
+        boot_seeds : list
+            Seeds of the bootstrap replicates.
+        tau_max : int
+            Maximum time lag.
+        """
+        dataframe = self.dataframe
+        bootstrap = dataframe.bootstrap
+        self._bootstrap_covariances = {}
+        if (bootstrap is None or self.significance != 'analytic'
+                or dataframe.missing_flag is not None):
+            return
+
+        # Valid reference points shared by all draws
+        dataframe.bootstrap = None
+        ref_points = dataframe.construct_reference_points(tau_max,
+                                                          cut_off='2xtau_max')
+        dataframe.bootstrap = bootstrap
+        if len(ref_points) == 0:
+            return
+
+        samples = self._get_lagged_samples(ref_points, tau_max)
+        # Shift by the overall mean for numerical stability
+        samples = samples - samples.mean(axis=0)
+
+        unique_seeds = OrderedDict((self._get_seed_key(boot_seed), boot_seed)
+                                   for boot_seed in boot_seeds)
+        seed_keys = list(unique_seeds)
+
+        # Replicates per block, bounding the size of the intermediate array
+        # of the batched products
+        block_size = max(1, 2**22 // (samples.shape[1] * samples.shape[0]))
+
+        self._bootstrap_covariances = {'dataframe': dataframe,
+                            'reference_points': dataframe.reference_points,
+                            'boot_blocklength': bootstrap['boot_blocklength'],
+                            'tau_max': tau_max,
+                            'ref_points': ref_points,
+                            'samples': samples,
+                            'seeds': list(unique_seeds.values()),
+                            'positions': {seed_key: b for b, seed_key
+                                          in enumerate(seed_keys)},
+                            'block_size': block_size,
+                            'covariances': {}}
+
+    def _get_bootstrap_block(self, precomputed, start):
+        """Returns the covariance matrices of one block of replicates.
+
+        Parameters
+        ----------
+        precomputed : dictionary
+            State set by precompute_bootstrap.
+        start : int
+            Position of the first replicate of the block.
+
+        Returns
+        -------
+        covariances : dictionary
+            Dictionary {seed_key: (cov, T)} of the replicates of the block.
+        """
+        dataframe = self.dataframe
+        bootstrap = dataframe.bootstrap
+        tau_max = precomputed['tau_max']
+        ref_points = precomputed['ref_points']
+        samples = precomputed['samples']
+        seeds = precomputed['seeds'][start:start + precomputed['block_size']]
+
+        offsets = np.cumsum([0] + [len(ref_points_here)
+                                   for ref_points_here in ref_points.values()])
+
+        # Counts of the reference points in the draw of each replicate
+        counts = np.zeros((len(seeds), samples.shape[0]))
+        original_random_state = bootstrap.get('random_state')
+        try:
+            for b, boot_seed in enumerate(seeds):
+                bootstrap['random_state'] = np.random.default_rng(boot_seed)
+                draws = dataframe.construct_reference_points(tau_max,
+                                                    cut_off='2xtau_max',
+                                                    return_counts=True)
+                for d, (dataset_key, ref_points_here) in enumerate(
+                                                        ref_points.items()):
+                    # Datasets may be missing from a draw of whole datasets
+                    if dataset_key not in draws:
+                        continue
+                    draw, draw_counts = draws[dataset_key]
+                    counts[b, offsets[d] + np.searchsorted(ref_points_here,
+                                                           draw)] = draw_counts
+        finally:
+            bootstrap['random_state'] = original_random_state
+
+        # Batched weighted moments. Each replicate is a separate product in
+        # the batch, so its result does not depend on the other replicates.
+        T = counts.sum(axis=1)
+        weighted = samples.T[None, :, :] * counts[:, None, :]
+        moments = np.matmul(weighted, samples) / T[:, None, None]
+        means = np.matmul(counts[:, None, :], samples)[:, 0, :] / T[:, None]
+        covs = moments - means[:, :, None] * means[:, None, :]
+        return {self._get_seed_key(boot_seed): (cov, int(T[b]))
+                for b, (boot_seed, cov) in enumerate(zip(seeds, covs))}
+
+    def _get_precomputed_covariance(self, tau_max):
+        """Returns the precomputed covariance of the current replicate or None.
+
+        If the replicate is not in the block computed last, the block of
+        precompute_bootstrap that contains it is computed and replaces it.
+        """
+        dataframe = self.dataframe
+        precomputed = self._bootstrap_covariances
+        if (dataframe.bootstrap is None
+                or dataframe.bootstrap.get('boot_seed') is None
+                or precomputed.get('dataframe') is not dataframe
+                or precomputed.get('reference_points') is not dataframe.reference_points
+                or precomputed.get('tau_max') != tau_max
+                or precomputed.get('boot_blocklength') != dataframe.bootstrap['boot_blocklength']):
+            return None
+
+        seed_key = self._get_seed_key(dataframe.bootstrap['boot_seed'])
+        if seed_key not in precomputed['covariances']:
+            position = precomputed['positions'].get(seed_key)
+            if position is None:
+                return None
+            block_size = precomputed['block_size']
+            # Drop the previous block before computing the next one
+            precomputed['covariances'] = {}
+            precomputed['covariances'] = self._get_bootstrap_block(
+                            precomputed, position - position % block_size)
+        return precomputed['covariances'][seed_key]
+
+    @staticmethod
+    def _get_seed_key(boot_seed):
+        """Returns a hashable key of a replicate seed."""
+        if isinstance(boot_seed, np.random.SeedSequence):
+            return (repr(boot_seed.entropy), boot_seed.spawn_key)
+        return tuple(np.ravel(boot_seed))
+
+    def get_partial_correlation(self, cov, x, y, z):
+        """Returns the partial correlation from a covariance matrix.
+
+        Parameters
+        ----------
+        cov : array
+            Covariance matrix.
+        x, y : int
+            Indices of X and Y in cov.
+        z : list of ints
+            Indices of the conditions Z in cov.
+
+        Returns
+        -------
+        val : float
+            Partial correlation coefficient.
+        """
+        xy = [x, y]
+        resid_cov = cov[np.ix_(xy, xy)]
+        if len(z) > 0:
+            cov_zz = cov[np.ix_(z, z)]
+            cov_zxy = cov[np.ix_(z, xy)]
+            try:
+                beta = np.linalg.solve(cov_zz, cov_zxy)
+            except np.linalg.LinAlgError:
+                beta = np.linalg.lstsq(cov_zz, cov_zxy, rcond=None)[0]
+            resid_cov = resid_cov - np.dot(cov_zxy.T, beta)
+
+        denom = np.sqrt(resid_cov[0, 0] * resid_cov[1, 1])
+        if denom == 0.:
+            return 0.
+        return float(np.clip(resid_cov[0, 1] / denom, -1., 1.))
+
+    def run_test(self, X, Y, Z=None, tau_max=0, cut_off='2xtau_max'):
+        """Perform conditional independence test.
+
+        Served from the lagged covariance matrix if possible, otherwise by
+        ParCorr.run_test. As in ParCorr, results are cached in
+        cached_ci_results, and NaNs in the samples of the test raise a
+        ValueError.
+
+        Parameters
+        ----------
+        X, Y, Z : list of tuples
+            X,Y,Z are of the form [(var, -tau)], where var specifies the
+            variable index and tau the time lag.
+
+        tau_max : int, optional (default: 0)
+            Maximum time lag.
+
+        cut_off : {'2xtau_max', 'max_lag', 'max_lag_or_tau_max'}
+            How many samples to cutoff at the beginning, see ParCorr.
+
+        Returns
+        -------
+        val, pval : Tuple of floats
+            The test statistic value and the p-value.
+        """
+        if Z is None:
+            Z = []
+
+        # Remove duplicates and overlaps as in construct_array
+        X = list(OrderedDict.fromkeys(X))
+        Y = list(OrderedDict.fromkeys(Y))
+        Z = [node for node in OrderedDict.fromkeys(Z)
+             if (node not in X) and (node not in Y)]
+
+        if not self._use_covariance(X, Y, Z, tau_max, cut_off):
+            return ParCorr.run_test(self, X, Y, Z, tau_max=tau_max,
+                                    cut_off=cut_off)
+
+        self.dataframe._check_nodes(Y, X + Y + Z, self.dataframe.Ndata,
+                                    len(X + Y + Z))
+
+        cov, T = self._get_covariance(tau_max)
+        index = lambda node: node[0]*(tau_max + 1) - node[1]
+        indices = [index(node) for node in X + Y + Z]
+
+        # NaNs in the samples of X, Y, Z show up on the diagonal. ParCorr
+        # then raises for the array of the test, or tests the drawn samples
+        # if the NaNs are only in samples that a bootstrap draw left out.
+        if np.any(np.isnan(cov[indices, indices])):
+            return ParCorr.run_test(self, X, Y, Z, tau_max=tau_max,
+                                    cut_off=cut_off)
+
+        # The covariance of X, Y, Z and the sample size determine the test,
+        # so they key the cache of CI results like the array in ParCorr
+        cov_xyz = cov[np.ix_(indices, indices)]
+        combined_hash = ('covariance', T, len(Z), cov_xyz.tobytes())
+
+        if combined_hash in self.cached_ci_results:
+            cached = True
+            val, pval = self.cached_ci_results[combined_hash]
+        else:
+            cached = False
+            val = self.get_partial_correlation(cov_xyz, 0, 1,
+                                               list(range(2, len(indices))))
+
+            dim = len(X + Y + Z)
+            xyz = np.array([0]*len(X) + [1]*len(Y) + [2]*len(Z))
+            pval = self.get_analytic_significance(value=val, T=T, dim=dim,
+                                                  xyz=xyz)
+            self.cached_ci_results[combined_hash] = (val, pval)
+
+        if self.verbosity > 1:
+            self._print_cond_ind_results(val=val, pval=pval, cached=cached,
+                                         conf=None)
+        return val, pval
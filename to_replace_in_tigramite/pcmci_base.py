@@ -2,15 +2,448 @@
 # License: GNU General Public License v3.0
 
 from __future__ import print_function
+import os
+import hashlib
+import inspect
+import pickle
+import time
 import warnings
 import itertools
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 import numpy as np
 import scipy.stats
 import math
 
 
+# Link types of graphs in the compact encoding of PCMCIbase.encode_graph,
+# where a link type is stored as its index in GRAPH_LINK_TYPES. Code 0 is the
+# absent link ""
+GRAPH_LINK_TYPES = tuple([""] + [left + middle + right
+                                 for middle in "-?"
+                                 for left in "-<ox+"
+                                 for right in "->ox+"])
+_GRAPH_LINK_CODES = {link: code for code, link in enumerate(GRAPH_LINK_TYPES)}
+
+
+def _run_bootstrap_chunk(pcmci, method, method_args, boot_seeds):
+    """Runs method on a chunk of bootstrap seeds inside a worker process."""
+    pcmci._prepare_bootstrap_replicates(method_args, boot_seeds)
+    return [pcmci._run_bootstrap_replicate(method, method_args, boot_seed)
+            for boot_seed in boot_seeds]
+
+
+def _run_window_chunk(pcmci, method, method_args, tasks):
+    """Runs method on a chunk of sliding windows inside a worker process.
+
+    tasks is a list of (window index, number of windows, time window).
+    """
+    return [pcmci._run_window(method, method_args, time_window, iw, n_windows)
+            for iw, n_windows, time_window in tasks]
+
+
+def _run_window_bootstrap_chunk(pcmci, method, method_args, tasks):
+    """Runs bootstrap replicates of sliding windows inside a worker process.
+
+    tasks is a list of (window index, time window, boot seed), ordered by
+    window index.
+    """
+    results = []
+    for _, window_tasks in itertools.groupby(tasks, key=lambda task: task[0]):
+        window_tasks = list(window_tasks)
+        pcmci.dataframe.reference_points = window_tasks[0][1]
+        results.extend(_run_bootstrap_chunk(pcmci, method, method_args,
+                            [boot_seed for _, _, boot_seed in window_tasks]))
+    return results
+
+
+def _summarize_link_counts(link_types, link_counts, n_results, dtype):
+    """Returns most frequent links and their frequency from link counts.
+
+    Ties between link types are broken as in
+    PCMCIbase.return_summary_results: the first of "", "x-x", "o-o" among the
+    tied types is chosen, and "x-x" if none of them is tied. The frequency of
+    a tie is the summed frequency of all tied types.
+
+    Parameters
+    ----------
+    link_types : list of strings
+        Link types, where link_types[k] is counted in link_counts[k].
+    link_counts : array of shape (len(link_types), N, N, tau_max + 1)
+        Number of results with each link type in each entry of the graph.
+    n_results : int
+        Number of results.
+    dtype : data-type
+        Data type of the returned most frequent links, either a string type
+        or uint8 for graphs encoded by PCMCIbase.encode_graph, in which case
+        link_types are link type codes.
+
+    Returns
+    -------
+    most_frequent_links, link_frequency : arrays of shape (N, N, tau_max + 1)
+    """
+    preferred_order = [ 
+        "", 
+        "x-x", 
+        # "x--",
+        # "--x",
+        # "x->",
+        # "<-x", 
+        # "x-o",
+        # "o-x",
+        "o-o",            
+        # "o--",
+        # "--o",
+        # "o->",
+        # "<-o",
+        # "---",
+        # "<->",
+        # "-->",
+        # "<--",
+        # "<-+",
+        # "+->",
+        ]
+
+    encoded = np.dtype(dtype) == np.uint8
+    if encoded:
+        link_names = [GRAPH_LINK_TYPES[link] for link in link_types]
+    else:
+        link_names = list(link_types)
+
+    def link_value(link):
+        return _GRAPH_LINK_CODES[link] if encoded else link
+
+    max_counts = link_counts.max(axis=0)
+    tied = link_counts == max_counts
+    n_tied = tied.sum(axis=0)
+
+    most_frequent_links = np.array(link_types, dtype=dtype)[
+                                        np.argmax(link_counts, axis=0)]
+    ties = n_tied > 1
+    most_frequent_links[ties] = link_value("x-x")
+    # Overwrite in reverse order so that the first preferred link type wins
+    for link in preferred_order[::-1]:
+        if link in link_names:
+            choose = ties & tied[link_names.index(link)]
+            most_frequent_links[choose] = link_value(link)
+
+    link_frequency = max_counts * n_tied / float(n_results)
+    return most_frequent_links, link_frequency
+
+
+def _get_link_type_frequency(link_types, link_counts, n_results, dtype):
+    """Returns the frequency of every link type of GRAPH_LINK_TYPES.
+
+    Link types of string graphs that are not in GRAPH_LINK_TYPES are
+    appended in sorted order.
+
+    Parameters
+    ----------
+    link_types, link_counts, n_results, dtype
+        See _summarize_link_counts.
+
+    Returns
+    -------
+    link_type_frequency : array of shape (len(summary_link_types), N, N,
+                          tau_max + 1)
+        Frequency of link type summary_link_types[k] in each entry of the
+        graph in link_type_frequency[k], as float32.
+    summary_link_types : list of strings
+        GRAPH_LINK_TYPES followed by the other link types of the graphs.
+    """
+    if np.dtype(dtype) == np.uint8:
+        link_types = [GRAPH_LINK_TYPES[link] for link in link_types]
+    summary_link_types = list(GRAPH_LINK_TYPES) + sorted(
+                set(link_types).difference(_GRAPH_LINK_CODES))
+    indices = {link: k for k, link in enumerate(summary_link_types)}
+
+    link_type_frequency = np.zeros((len(summary_link_types),)
+                                   + link_counts.shape[1:], dtype='float32')
+    link_type_frequency[[indices[link]
+                         for link in link_types]] = link_counts / float(n_results)
+    return link_type_frequency, summary_link_types
+
+
+class BootstrapAggregator():
+    r"""Running aggregate of bootstrap results.
+
+    Keeps the number of results of each link type in each graph entry, the
+    sum of val_matrix and a histogram of val_matrix per entry, so that the
+    summary results of PCMCIbase.return_summary_results can be computed
+    without retaining the individual results. Memory is constant in the
+    number of results.
+
+    The histogram has n_bins bins on a symmetric range [-R, R]. R starts as
+    the smallest power of two covering the absolute values of the first
+    result and is doubled, merging pairs of bins, whenever a value falls
+    outside. Percentiles of
+    val_matrix_interval are interpolated within bins and thus only accurate
+    up to the bin width 2R/n_bins, while val_matrix_mean, most_frequent_links
+    and link_frequency are exact.
+
+    Aggregators can be combined with merge() or +, e.g., to combine the
+    results of bootstrap runs on different nodes without transferring the
+    individual results.
+
+    Parameters
+    ----------
+    conf_lev : float, optional (default: 0.9)
+        Two-sided confidence interval for summary results.
+    n_bins : int, optional (default: 200)
+        Number of histogram bins per entry of val_matrix. Must be divisible
+        by 4.
+    keep_histogram : bool, optional (default: True)
+        Whether to keep the histogram of val_matrix. Without it, the
+        summary results lack val_matrix_interval, which saves the memory
+        of n_bins counts per entry if the percentiles are computed from the
+        individual results.
+    """
+    def __init__(self, conf_lev=0.9, n_bins=200, keep_histogram=True):
+        if n_bins % 4 != 0 or n_bins < 4:
+            raise ValueError("n_bins must be a positive multiple of 4.")
+        self.conf_lev = conf_lev
+        self.n_bins = n_bins
+        self.keep_histogram = keep_histogram
+        self.n_results = 0
+        self.link_types = []
+        self.link_counts = None
+        self.graph_dtype = None
+        self.val_sum = None
+        self.val_min = None
+        self.val_max = None
+        self.val_range = None
+        self.val_histogram = None
+
+    def update(self, results):
+        """Adds one result.
+
+        Parameters
+        ----------
+        results : dict
+            Results dictionary of one replicate with val_matrix and optionally
+            graph, both of shape (N, N, tau_max + 1).
+        """
+        if 'graph' in results:
+            self._update_links(results['graph'])
+        self._update_val_matrix(np.asarray(results['val_matrix'], dtype='float'))
+        self.n_results += 1
+
+    def _update_links(self, graph):
+        """Adds the link types of one graph to the link counts."""
+        if self.link_counts is None:
+            self.graph_dtype = graph.dtype
+            self.link_counts = np.zeros((0,) + graph.shape, dtype='int32')
+
+        for link in np.unique(graph):
+            if link not in self.link_types:
+                self.link_types.append(link.item())
+                self.link_counts = np.concatenate((self.link_counts,
+                        np.zeros((1,) + graph.shape, dtype='int32')), axis=0)
+            self.link_counts[self.link_types.index(link)] += graph == link
+
+    def _update_val_matrix(self, val_matrix):
+        """Adds one val_matrix to the running sum and histogram."""
+        if self.val_sum is None:
+            self.val_sum = np.zeros(val_matrix.shape)
+            self.val_min = np.full(val_matrix.shape, np.inf)
+            self.val_max = np.full(val_matrix.shape, -np.inf)
+        if self.keep_histogram and self.val_histogram is None:
+            # Counts never approach 2**31
+            self.val_histogram = np.zeros(val_matrix.shape + (self.n_bins,),
+                                          dtype='int32')
+            # Ranges are powers of two, so that histograms of different
+            # aggregators can be aligned when merging
+            max_abs = np.nanmax(np.abs(val_matrix), initial=0.)
+            self.val_range = 1.
+            if max_abs > 0.:
+                self.val_range = 2.**np.ceil(np.log2(max_abs))
+
+        self.val_sum += val_matrix
+        self.val_min = np.fmin(self.val_min, val_matrix)
+        self.val_max = np.fmax(self.val_max, val_matrix)
+        if not self.keep_histogram:
+            return
+
+        self._expand_range(np.nanmax(np.abs(val_matrix), initial=0.))
+        valid = ~np.isnan(val_matrix)
+        bins = self._get_bins(val_matrix[valid])
+        self.val_histogram[valid, bins] += 1
+
+    def _get_bins(self, values):
+        """Returns the histogram bin of each value."""
+        bins = np.floor((values + self.val_range) / (2. * self.val_range)
+                        * self.n_bins).astype('int')
+        return np.clip(bins, 0, self.n_bins - 1)
+
+    @staticmethod
+    def _double_range(histogram):
+        """Returns histogram rebinned to twice its symmetric range.
+
+        The old range becomes the middle half of the new range, where each
+        new bin covers two old ones.
+        """
+        n_bins = histogram.shape[-1]
+        doubled = np.zeros_like(histogram)
+        doubled[..., n_bins//4:3*n_bins//4] = (histogram[..., 0::2]
+                                               + histogram[..., 1::2])
+        return doubled
+
+    def _expand_range(self, max_abs):
+        """Doubles the histogram range until it covers max_abs."""
+        while max_abs > self.val_range:
+            self.val_histogram = self._double_range(self.val_histogram)
+            self.val_range *= 2.
+
+    def merge(self, other):
+        """Adds the results aggregated in another aggregator.
+
+        Merging is associative and commutative up to floating point rounding
+        of val_matrix_mean, so aggregators of different shards of a
+        bootstrap run (see boot_range in PCMCIbase.run_bootstrap_of) can be
+        combined in any order.
+
+        Parameters
+        ----------
+        other : BootstrapAggregator
+            Aggregator with the same n_bins.
+
+        Returns
+        -------
+        self : BootstrapAggregator
+        """
+        if other.n_bins != self.n_bins:
+            raise ValueError("Cannot merge aggregators with n_bins %d and %d."
+                             % (self.n_bins, other.n_bins))
+        if not (self.keep_histogram and other.keep_histogram):
+            raise ValueError("Cannot merge aggregators without histogram.")
+        if other.n_results == 0:
+            return self
+        if self.n_results == 0:
+            conf_lev = self.conf_lev
+            self.__dict__.update(deepcopy(other.__dict__))
+            self.conf_lev = conf_lev
+            return self
+
+        if other.link_counts is not None:
+            if self.link_counts is None:
+                self.graph_dtype = other.graph_dtype
+                self.link_counts = np.zeros((0,) + other.link_counts.shape[1:],
+                                            dtype='int32')
+            if (np.dtype(self.graph_dtype) == np.uint8) != (
+                                    np.dtype(other.graph_dtype) == np.uint8):
+                raise ValueError("Cannot merge aggregators of encoded and "
+                                 "string graphs.")
+            self.graph_dtype = np.promote_types(self.graph_dtype,
+                                                other.graph_dtype)
+            for k, link in enumerate(other.link_types):
+                if link not in self.link_types:
+                    self.link_types.append(link)
+                    self.link_counts = np.concatenate((self.link_counts,
+                            np.zeros((1,) + self.link_counts.shape[1:],
+                                     dtype='int32')), axis=0)
+                self.link_counts[self.link_types.index(link)] += other.link_counts[k]
+
+        self.val_sum = self.val_sum + other.val_sum
+        self.val_min = np.fmin(self.val_min, other.val_min)
+        self.val_max = np.fmax(self.val_max, other.val_max)
+
+        # Bring both histograms to the larger of the two ranges
+        self._expand_range(other.val_range)
+        other_histogram = other.val_histogram
+        other_range = other.val_range
+        while other_range < self.val_range:
+            other_histogram = self._double_range(other_histogram)
+            other_range *= 2.
+        self.val_histogram = self.val_histogram + other_histogram
+
+        self.n_results += other.n_results
+        return self
+
+    def __add__(self, other):
+        return deepcopy(self).merge(other)
+
+    def _get_percentile(self, q):
+        """Returns the q-th percentile of val_matrix estimated from the histogram.
+
+        As in np.percentile, the percentile is linearly interpolated between
+        the two nearest ranks. The value of a rank is interpolated within its
+        bin, assuming that the values of a bin are evenly spread.
+        """
+        histogram = self.val_histogram
+        n_valid = histogram.sum(axis=-1)
+        cumulative = np.cumsum(histogram, axis=-1)
+        width = 2. * self.val_range / self.n_bins
+
+        def rank_value(rank):
+            bins = (cumulative <= rank[..., None]).sum(axis=-1)
+            bins = np.minimum(bins, self.n_bins - 1)
+            in_bin = np.take_along_axis(histogram, bins[..., None], axis=-1)[..., 0]
+            before = np.take_along_axis(cumulative, bins[..., None], axis=-1)[..., 0] - in_bin
+            position = (rank - before + 0.5) / np.maximum(in_bin, 1)
+            return -self.val_range + (bins + position) * width
+
+        rank = q / 100. * np.maximum(n_valid - 1, 0)
+        lower = np.floor(rank)
+        upper = np.minimum(lower + 1, np.maximum(n_valid - 1, 0))
+        fraction = rank - lower
+        value = ((1. - fraction) * rank_value(lower)
+                 + fraction * rank_value(upper))
+        value = np.clip(value, self.val_min, self.val_max)
+
+        # Propagate NaNs as np.percentile does
+        value[np.isnan(self.val_sum)] = np.nan
+        return value
+
+    def get_link_frequency_se(self):
+        """Returns the binomial standard error of the link frequency.
+
+        Returns
+        -------
+        link_frequency_se : array of shape (N, N, tau_max + 1)
+            Standard error sqrt(f(1-f)/n_results) of the link frequency f of
+            the most frequent link in each entry.
+        """
+        if self.link_counts is None:
+            raise ValueError("Results contain no graph.")
+        _, link_frequency = _summarize_link_counts(self.link_types,
+                                self.link_counts, self.n_results,
+                                self.graph_dtype)
+        return np.sqrt(link_frequency * (1. - link_frequency) / self.n_results)
+
+    def get_summary_results(self):
+        """Returns the summary results of all added results.
+
+        Returns
+        -------
+        Dictionary of summary results as in PCMCIbase.return_summary_results,
+        without val_matrix_interval if keep_histogram is False.
+        """
+        if self.n_results == 0:
+            raise ValueError("No results have been added.")
+
+        summary_results = {}
+        if self.link_counts is not None:
+            (summary_results['most_frequent_links'],
+             summary_results['link_frequency']) = _summarize_link_counts(
+                                self.link_types, self.link_counts,
+                                self.n_results, self.graph_dtype)
+            (summary_results['link_type_frequency'],
+             summary_results['link_types']) = _get_link_type_frequency(
+                                self.link_types, self.link_counts,
+                                self.n_results, self.graph_dtype)
+
+        # Confidence intervals for val_matrix; interval is two-sided
+        c_int = (1. - (1. - self.conf_lev)/2.)
+        summary_results['val_matrix_mean'] = self.val_sum / self.n_results
+        if not self.keep_histogram:
+            return summary_results
+        summary_results['val_matrix_interval'] = np.stack(
+                                [self._get_percentile(100*(1. - c_int)),
+                                 self._get_percentile(100*c_int)], axis=3)
+        return summary_results
+
+
 class PCMCIbase():
     r"""PCMCI base class.
 
@@ -69,6 +502,12 @@ class PCMCIbase():
         self.T = self.dataframe.T
         self.N = self.dataframe.N
 
+        # Compiled link assumptions, see _get_compiled_link_assumptions
+        self._link_assumptions_cache = {}
+        self._compiled_link_dicts = {}
+        # Private copy of the link assumptions of the current bootstrap or
+        # sliding window run, see _freeze_link_assumptions
+        self._frozen_link_assumptions = None
 
     def _reverse_link(self, link):
         """Reverse a given link, taking care to replace > with < and vice versa."""
@@ -112,10 +551,16 @@ class PCMCIbase():
 
         return any(visit(v) for v in link_dict)
 
+    # Maximum number of compiled link assumptions kept per object
+    _max_link_assumptions_cache = 64
+
     def _set_link_assumptions(self, link_assumptions, tau_min, tau_max,
                        remove_contemp=False):
         """Helper function to set and check the link_assumptions argument
 
+        The returned dictionary is cached for identical arguments, see
+        _get_compiled_link_assumptions, and must not be modified.
+
         Parameters
         ----------
         link_assumptions : dict
@@ -143,6 +588,128 @@ class PCMCIbase():
         link_assumptions : dict
             Cleaned links.
         """
+        return self._get_compiled_link_assumptions(link_assumptions, tau_min,
+                                    tau_max, remove_contemp)['link_dict']
+
+    def _get_compiled_link_assumptions(self, link_assumptions, tau_min,
+                                       tau_max, remove_contemp=False):
+        """Returns the cleaned link assumptions in dictionary and array form.
+
+        Cleaning and checking the link assumptions, including the search for
+        contemporaneous cycles, is done once per distinct arguments. The
+        result is cached under the sorted contents of link_assumptions
+        together with tau_min, tau_max, N and remove_contemp. Building this
+        key takes one pass over all links of link_assumptions, i.e.,
+        O(N**2 * tau_max). Two kinds of dictionaries are recognized by their
+        identity in O(1) instead: cleaned dictionaries returned before, and
+        the private copy of the link assumptions of a bootstrap or sliding
+        window run (see _freeze_link_assumptions), which is passed to every
+        replicate and window.
+
+        Parameters
+        ----------
+        link_assumptions, tau_min, tau_max, remove_contemp
+            See _set_link_assumptions.
+
+        Returns
+        -------
+        compiled : dict
+            Dictionary with the cleaned link assumptions (link_dict) and an
+            array of shape (N, N, tau_max + 1) (link_codes), where
+            link_codes[i, j, abs(lag)] is the index of
+            link_dict[j][(i, lag)] in GRAPH_LINK_TYPES, or 0 if the link is
+            absent. Both must not be modified.
+        """
+        settings = (tau_min, tau_max, self.N, remove_contemp)
+
+        compiled = self._compiled_link_dicts.get(id(link_assumptions))
+        if (compiled is not None and compiled['link_dict'] is link_assumptions
+                and compiled['settings'] == settings):
+            return compiled
+
+        frozen = self._frozen_link_assumptions
+        if frozen is not None and frozen['link_assumptions'] is link_assumptions:
+            if settings not in frozen['compiled']:
+                frozen['compiled'][settings] = \
+                    self._compile_link_assumptions(link_assumptions, settings)
+            return frozen['compiled'][settings]
+
+        return self._compile_link_assumptions(link_assumptions, settings)
+
+    def _compile_link_assumptions(self, link_assumptions, settings):
+        """Returns the compiled link assumptions cached under their contents,
+        see _get_compiled_link_assumptions."""
+        tau_min, tau_max, _, remove_contemp = settings
+        try:
+            key = (None if link_assumptions is None else
+                   tuple(sorted((j, tuple(sorted(links.items())))
+                                for j, links in link_assumptions.items())))
+            key = (key,) + settings
+            hash(key)
+        except (AttributeError, TypeError):
+            # Malformed link assumptions are not cached, cleaning them raises
+            # the appropriate error
+            key = None
+
+        if key is not None and key in self._link_assumptions_cache:
+            return self._link_assumptions_cache[key]
+
+        link_dict = self._clean_link_assumptions(link_assumptions, tau_min,
+                                                 tau_max, remove_contemp)
+        link_codes = np.zeros((self.N, self.N, tau_max + 1), dtype='uint8')
+        for j, links_ in link_dict.items():
+            for (i, lag), link_type in links_.items():
+                link_codes[i, j, abs(lag)] = _GRAPH_LINK_CODES[link_type]
+        compiled = {'link_dict': link_dict,
+                    'link_codes': link_codes,
+                    'settings': settings}
+
+        if key is not None:
+            if len(self._link_assumptions_cache) >= self._max_link_assumptions_cache:
+                # Drop the oldest entry
+                oldest = self._link_assumptions_cache.pop(
+                                    next(iter(self._link_assumptions_cache)))
+                del self._compiled_link_dicts[id(oldest['link_dict'])]
+            self._link_assumptions_cache[key] = compiled
+            self._compiled_link_dicts[id(link_dict)] = compiled
+        return compiled
+
+    def _freeze_link_assumptions(self, method_args):
+        """Returns method_args with a private copy of the link assumptions.
+
+        The copy cannot be modified by the caller during the run, so its
+        compiled form is cached by identity for every setting of tau_min,
+        tau_max and remove_contemp, and the replicates or windows of a
+        bootstrap or sliding window run look it up in O(1). The copy travels
+        to worker processes together with this object, which keeps the
+        identity.
+
+        Parameters
+        ----------
+        method_args : dict
+            Arguments passed to the method of the run.
+
+        Returns
+        -------
+        method_args : dict
+            Copy of method_args with the private link assumptions.
+        """
+        self._frozen_link_assumptions = None
+        if method_args.get('link_assumptions') is None:
+            return method_args
+
+        method_args = dict(method_args)
+        method_args['link_assumptions'] = deepcopy(
+                                        method_args['link_assumptions'])
+        self._frozen_link_assumptions = {
+                            'link_assumptions': method_args['link_assumptions'],
+                            'compiled': {}}
+        return method_args
+
+    def _clean_link_assumptions(self, link_assumptions, tau_min, tau_max,
+                                remove_contemp=False):
+        """Returns cleaned and checked link assumptions, see
+        _set_link_assumptions."""
         # Copy and pass into the function
         _int_link_assumptions = deepcopy(link_assumptions)
         # Set the default selected links if none are set
@@ -269,10 +836,15 @@ class PCMCIbase():
         method. Correction is performed either among all links if
         exclude_contemporaneous==False, or only among lagged links.
 
+        p_matrix may also be a stack of p-matrices, e.g., of bootstrap
+        replicates, which are then corrected separately. The mask of links to
+        correct is built only once for the whole stack.
+
         Parameters
         ----------
         p_matrix : array-like
-            Matrix of p-values. Must be of shape (N, N, tau_max + 1).
+            Matrix of p-values. Must be of shape (N, N, tau_max + 1) or
+            (B, N, N, tau_max + 1) for a stack of B matrices.
         tau_min : int, default: 0
             Minimum time lag. Only used as consistency check of link_assumptions. 
         tau_max : int, default: 1
@@ -300,29 +872,26 @@ class PCMCIbase():
         Returns
         -------
         q_matrix : array-like
-            Matrix of shape (N, N, tau_max + 1) containing corrected p-values.
+            Matrix of the shape of p_matrix containing corrected p-values.
         """
 
-        def _ecdf(x):
-            """No frills empirical cdf used in fdr correction.
-            """
-            nobs = len(x)
-            return np.arange(1, nobs + 1) / float(nobs)
-
         # Get the shape parameters from the p_matrix
-        _, N, tau_max_plusone = p_matrix.shape
+        p_matrix = np.asarray(p_matrix)
+        if p_matrix.ndim not in (3, 4):
+            raise ValueError("p_matrix must be of shape (N, N, tau_max + 1) "
+                             "or (B, N, N, tau_max + 1).")
+        N, tau_max_plusone = p_matrix.shape[-2:]
         # Check the limits on tau
         self._check_tau_limits(tau_min, tau_max)
         # Include only link_assumptions if given
         if link_assumptions != None:
             # Create a mask for these values
+            link_codes = self._get_compiled_link_assumptions(link_assumptions,
+                                            tau_min, tau_max)['link_codes']
+            n_lags = min(tau_max_plusone, link_codes.shape[2])
             mask = np.zeros((N, N, tau_max_plusone), dtype='bool')
-            _int_link_assumptions = self._set_link_assumptions(link_assumptions, tau_min, tau_max)
-            for j, links_ in _int_link_assumptions.items():
-                for link in links_:
-                    i, lag = link
-                    if _int_link_assumptions[j][link] not in ["<--", "<?-"]:    
-                        mask[i, j, abs(lag)] = True
+            mask[:, :, :n_lags] = np.isin(link_codes[:, :, :n_lags],
+                        self._get_link_type_codes(['o-o', 'o?o', '-->', '-?>']))
         else:
             # Create a mask for these values
             mask = np.ones((N, N, tau_max_plusone), dtype='bool')
@@ -337,23 +906,27 @@ class PCMCIbase():
         if fdr_method is None or fdr_method == 'none':
             pass
         elif fdr_method == 'fdr_bh':
-            pvs = p_matrix[mask]
-            pvals_sortind = np.argsort(pvs)
-            pvals_sorted = np.take(pvs, pvals_sortind)
+            # Masked p-values of every matrix along the last axis
+            pvs = p_matrix[..., mask]
+            pvals_sortind = np.argsort(pvs, axis=-1)
+            pvals_sorted = np.take_along_axis(pvs, pvals_sortind, axis=-1)
 
-            ecdffactor = _ecdf(pvals_sorted)
+            # Empirical cdf of the sorted p-values
+            nobs = pvs.shape[-1]
+            ecdffactor = np.arange(1, nobs + 1) / float(nobs)
 
             pvals_corrected_raw = pvals_sorted / ecdffactor
             pvals_corrected = np.minimum.accumulate(
-                pvals_corrected_raw[::-1])[::-1]
+                pvals_corrected_raw[..., ::-1], axis=-1)[..., ::-1]
             del pvals_corrected_raw
 
             pvals_corrected[pvals_corrected > 1] = 1
             pvals_corrected_ = np.empty_like(pvals_corrected)
-            pvals_corrected_[pvals_sortind] = pvals_corrected
+            np.put_along_axis(pvals_corrected_, pvals_sortind,
+                              pvals_corrected, axis=-1)
             del pvals_corrected
 
-            q_matrix[mask] = pvals_corrected_
+            q_matrix[..., mask] = pvals_corrected_
 
         else:
             raise ValueError('Only FDR method fdr_bh implemented')
@@ -589,10 +1162,94 @@ class PCMCIbase():
 
         return graph
 
+    @staticmethod
+    def encode_graph(graph):
+        """Converts a string graph to the compact uint8 encoding.
+
+        Every link type is stored as its index in GRAPH_LINK_TYPES, with 0
+        for the absent link "". This needs one byte instead of twelve per
+        entry of a '<U3' graph, and link types are compared as integers.
+
+        Parameters
+        ----------
+        graph : array
+            Graph of any shape as string array with links such as '-->',
+            'o-o' or 'x-x'. Graphs that are already encoded are returned
+            unchanged.
+
+        Returns
+        -------
+        graph : array of dtype uint8
+            Encoded graph of the same shape.
+        """
+        graph = np.asarray(graph)
+        if graph.dtype == np.uint8:
+            return graph
+        link_types, inverse = np.unique(graph, return_inverse=True)
+        unknown = [str(link) for link in link_types
+                   if str(link) not in _GRAPH_LINK_CODES]
+        if len(unknown) > 0:
+            raise ValueError("Unknown link types %s in graph." % str(unknown))
+        codes = np.array([_GRAPH_LINK_CODES[str(link)] for link in link_types],
+                         dtype='uint8')
+        return codes[inverse].reshape(graph.shape)
+
+    @staticmethod
+    def decode_graph(graph):
+        """Converts a graph encoded by encode_graph to a string graph.
+
+        Parameters
+        ----------
+        graph : array of dtype uint8
+            Encoded graph of any shape. String graphs are returned unchanged.
+
+        Returns
+        -------
+        graph : array of dtype '<U3'
+            Graph of the same shape as string array.
+        """
+        graph = np.asarray(graph)
+        if graph.dtype != np.uint8:
+            return graph
+        return np.array(GRAPH_LINK_TYPES, dtype='<U3')[graph]
+
+    def _get_link_type_codes(self, link_types):
+        """Returns the integer codes of link_types, see GRAPH_LINK_TYPES."""
+        return [_GRAPH_LINK_CODES[link_type] for link_type in link_types]
+
+    def _get_contemp_link_masks(self, link_assumptions):
+        """Returns boolean masks of the contemporaneous link assumptions.
+
+        Returns
+        -------
+        circle_links, directed_links : arrays of shape (N, N)
+            circle_links[i, j] is True if link_assumptions[j][(i, 0)] is
+            'o-o' or 'o?o', and directed_links[i, j] if it is '-->' or
+            '-?>'.
+        """
+        compiled = self._compiled_link_dicts.get(id(link_assumptions))
+        if compiled is not None and compiled['link_dict'] is link_assumptions:
+            link_codes = compiled['link_codes'][:, :, 0]
+        else:
+            link_codes = np.zeros((self.N, self.N), dtype='uint8')
+            for j, links_ in link_assumptions.items():
+                for (i, lag), link_type in links_.items():
+                    if lag == 0 and link_type in _GRAPH_LINK_CODES:
+                        link_codes[i, j] = _GRAPH_LINK_CODES[link_type]
+        circle_links = np.isin(link_codes,
+                               self._get_link_type_codes(['o-o', 'o?o']))
+        directed_links = np.isin(link_codes,
+                                 self._get_link_type_codes(['-->', '-?>']))
+        return circle_links, directed_links
+
     def symmetrize_p_and_val_matrix(self, p_matrix, val_matrix, link_assumptions, conf_matrix=None):
         """Symmetrizes the p_matrix, val_matrix, and conf_matrix based on link_assumptions
            and the larger p-value.
 
+        The matrices may also be stacks of matrices, e.g., of bootstrap
+        replicates, with the stack dimensions first. They are modified in
+        place.
+
         Parameters
         ----------
         val_matrix : array of shape [N, N, tau_max+1]
@@ -628,30 +1285,31 @@ class PCMCIbase():
             are set.
         """
 
-        # Symmetrize p_matrix and val_matrix and conf_matrix
-        for i in range(self.N):
-            for j in range(self.N):
-                # If both the links are present in selected_links, symmetrize using maximum p-value
-                # if ((i, 0) in selected_links[j] and (j, 0) in selected_links[i]):
-                if (i, 0) in link_assumptions[j]:
-                    if link_assumptions[j][(i, 0)] in ["o-o", 'o?o']:
-                        if (p_matrix[i, j, 0]
-                                >= p_matrix[j, i, 0]):
-                            p_matrix[j, i, 0] = p_matrix[i, j, 0]
-                            val_matrix[j, i, 0] = val_matrix[i, j, 0]
-                            if conf_matrix is not None:
-                                conf_matrix[j, i, 0] = conf_matrix[i, j, 0]
-
-                    # If only one of the links is present in selected_links, symmetrize using the p-value of the link present
-                    # elif ((i, 0) in selected_links[j] and (j, 0) not in selected_links[i]):
-                    elif link_assumptions[j][(i, 0)] in ["-->", '-?>']:
-                        p_matrix[j, i, 0] = p_matrix[i, j, 0]
-                        val_matrix[j, i, 0] = val_matrix[i, j, 0]
-                        if conf_matrix is not None:
-                            conf_matrix[j, i, 0] = conf_matrix[i, j, 0]
-                    else:
-                        # Links not present in link_assumptions
-                        pass
+        circle_links, directed_links = self._get_contemp_link_masks(
+                                                            link_assumptions)
+
+        # Symmetrize p_matrix and val_matrix and conf_matrix at lag zero. For
+        # i < j, the pair is visited as (i, j) before (j, i): entry [j, i] is
+        # replaced by [i, j] if link i o-o j has the larger p-value at [i, j]
+        # (or link i --> j is assumed), and [i, j] by [j, i] in the same way
+        # unless [j, i] was already replaced.
+        p_contemp = p_matrix[..., 0]
+        p_transposed = np.swapaxes(p_contemp, -1, -2)
+        replace = ((circle_links.T & (p_transposed >= p_contemp))
+                   | directed_links.T)
+        lower = np.tri(self.N, k=-1, dtype='bool')
+        replace &= lower | ~np.swapaxes(replace, -1, -2)
+
+        p_matrix[..., 0] = np.where(replace, p_transposed, p_contemp)
+        val_contemp = val_matrix[..., 0]
+        val_matrix[..., 0] = np.where(replace,
+                                      np.swapaxes(val_contemp, -1, -2),
+                                      val_contemp)
+        if conf_matrix is not None:
+            conf_contemp = conf_matrix[..., 0, :]
+            conf_matrix[..., 0, :] = np.where(replace[..., None],
+                                        np.swapaxes(conf_contemp, -2, -3),
+                                        conf_contemp)
 
         # Return the values as a dictionary and store in class
         results = {'val_matrix': val_matrix,
@@ -663,6 +1321,7 @@ class PCMCIbase():
                         window_step,
                         window_length,
                         conf_lev = 0.9,
+                        n_jobs=1, executor=None,
                         ):
         """Runs chosen method on sliding windows taken from DataFrame.
 
@@ -687,6 +1346,16 @@ class PCMCIbase():
             Length of sliding window.
         conf_lev : float, optional (default: 0.9)
             Two-sided confidence interval for summary results.
+        n_jobs : int, optional (default: 1)
+            Number of worker processes. If 1, windows are run serially in
+            this process. If None or -1, all available CPUs are used. Each
+            worker runs its windows on its own copy of this object, so the
+            reference points of this dataframe are not changed. With
+            shuffle significance tests, the random draws then depend on how
+            the windows are split among the workers.
+        executor : concurrent.futures.Executor, optional (default: None)
+            Executor to submit the windows to instead of a new
+            ProcessPoolExecutor, e.g., an mpi4py.futures.MPIPoolExecutor.
 
         Returns
         -------
@@ -712,8 +1381,6 @@ class PCMCIbase():
                              "sliding windows analysis, align data before and use masking"
                              " and/or missing values.")
 
-        T = self.dataframe.largest_time_step
-
         if self.cond_ind_test.recycle_residuals:
             # recycle_residuals clashes with sliding windows...
             raise ValueError("cond_ind_test.recycle_residuals must be False.")
@@ -726,24 +1393,25 @@ class PCMCIbase():
                   )
 
         original_reference_points = deepcopy(self.dataframe.reference_points)
+        method_args = self._freeze_link_assumptions(method_args)
 
-        window_start_points = np.arange(0, T - window_length, window_step)
-        n_windows = len(window_start_points)
+        time_windows = self._get_time_windows(window_step, window_length)
+        n_windows = len(time_windows)
 
-        if len(window_start_points) == 0:
-            raise ValueError("Empty list of windows, check window_length and window_step!")
+        if n_jobs == 1 and executor is None:
+            window_iterator = (self._run_window(method, method_args,
+                                                time_window, iw, n_windows)
+                               for iw, time_window in enumerate(time_windows))
+        else:
+            window_iterator = self._iter_in_workers(_run_window_chunk, method,
+                                        method_args,
+                                        [(iw, n_windows, time_window)
+                                         for iw, time_window
+                                         in enumerate(time_windows)],
+                                        n_jobs=n_jobs, executor=executor)
 
         window_results = {}
-        for iw, w in enumerate(window_start_points):
-            if self.verbosity > 0:
-                print("\n# Window start %s (%d/%d) \n" %(w, iw+1, len(window_start_points)))                
-            # Construct reference_points from window
-            time_window = np.arange(w, w + window_length, 1)
-            # Remove points beyond T
-            time_window = time_window[time_window < T]
-
-            self.dataframe.reference_points = time_window
-            window_res = deepcopy(getattr(self, method)(**method_args))
+        for iw, window_res in enumerate(window_iterator):
 
             # Aggregate val_matrix and other arrays to new arrays with
             # windows as first dimension. Lists and other objects
@@ -763,6 +1431,7 @@ class PCMCIbase():
         # Reset to original_reference_points data for further analyses
         # self.dataframe.values[0] = original_data
         self.dataframe.reference_points = original_reference_points
+        self._frozen_link_assumptions = None
 
         # Generate summary results
         summary_results = self.return_summary_results(results=window_results, 
@@ -771,10 +1440,282 @@ class PCMCIbase():
         return {'summary_results': summary_results, 
                 'window_results': window_results}
 
-    def run_bootstrap_of(self, method, method_args, 
+    def _get_time_windows(self, window_step, window_length):
+        """Returns the reference points of all sliding windows."""
+        T = self.dataframe.largest_time_step
+
+        window_start_points = np.arange(0, T - window_length, window_step)
+
+        if len(window_start_points) == 0:
+            raise ValueError("Empty list of windows, check window_length and window_step!")
+
+        time_windows = []
+        for w in window_start_points:
+            # Construct reference_points from window
+            time_window = np.arange(w, w + window_length, 1)
+            # Remove points beyond T
+            time_window = time_window[time_window < T]
+            time_windows.append(time_window)
+        return time_windows
+
+    def _run_window(self, method, method_args, time_window, iw, n_windows):
+        """Runs method on the samples with reference points in time_window.
+
+        iw is the index of the window among n_windows windows.
+        """
+        if self.verbosity > 0:
+            print("\n# Window start %s (%d/%d) \n" % (time_window[0], iw+1,
+                                                     n_windows))
+        self.dataframe.reference_points = time_window
+        return deepcopy(getattr(self, method)(**method_args))
+
+    def _get_bootstrap_settings(self, boot_blocklength, boot_method,
+                                boot_fraction):
+        """Returns the bootstrap attribute of the dataframe for a run.
+
+        With boot_blocklength='from_autocorrelation', the block lengths of
+        all datasets are estimated here, before any replicate is run. The
+        dataframe caches them, so they are pickled with it to worker
+        processes instead of being estimated again in every chunk.
+        """
+        valid_boot_methods = ['block', 'circular', 'stationary', 'subsample',
+                              'datasets']
+        if boot_method not in valid_boot_methods:
+            raise ValueError("boot_method must be one of %s"
+                             % str(valid_boot_methods))
+        if boot_method == 'subsample' and not 0. < boot_fraction <= 1.:
+            raise ValueError("boot_fraction must be in (0, 1].")
+
+        bootstrap = {'boot_blocklength': boot_blocklength,
+                     'boot_method': boot_method}
+        if boot_method == 'subsample':
+            bootstrap['boot_fraction'] = boot_fraction
+
+        if (boot_blocklength == 'from_autocorrelation'
+                and boot_method != 'datasets'):
+            for dataset_key in self.dataframe.values:
+                self.dataframe._get_autocorrelation_block_length(dataset_key)
+        return bootstrap
+
+    def _run_bootstrap_replicate(self, method, method_args, boot_seed):
+        """Runs method on the bootstrap sample drawn with boot_seed.
+
+        The random state of cond_ind_test is reseeded from boot_seed and its
+        cache of CI results is cleared, so that the result of a replicate does
+        not depend on which replicates were run before it in the same process.
+        """
+        # Generate random state for this boot and set it in dataframe
+        # which will generate a draw with replacement
+        boot_random_state = np.random.default_rng(boot_seed)
+        self.dataframe.bootstrap['random_state'] = boot_random_state
+        self.dataframe.bootstrap['boot_seed'] = boot_seed
+
+        # Child of boot_seed as spawned by boot_seed.spawn(1), created
+        # without changing the state of boot_seed
+        self.cond_ind_test.random_state = np.random.default_rng(
+                                np.random.SeedSequence(boot_seed.entropy,
+                                    spawn_key=boot_seed.spawn_key + (0,)))
+        self.cond_ind_test.cached_ci_results = {}
+
+        return getattr(self, method)(**method_args)
+
+    def _prepare_bootstrap_replicates(self, method_args, boot_seeds):
+        """Lets cond_ind_test precompute statistics of all replicates at once.
+
+        CI tests that implement precompute_bootstrap (such as ParCorrCov) can
+        evaluate all bootstrap draws of boot_seeds in a batch before the
+        replicates are run one by one.
+        """
+        if hasattr(self.cond_ind_test, 'precompute_bootstrap'):
+            self.cond_ind_test.precompute_bootstrap(boot_seeds,
+                                                    method_args['tau_max'])
+
+    def _get_checkpoint_path(self, checkpoint_dir, arguments):
+        """Returns the checkpoint file for the arguments of a bootstrap run.
+
+        The file name contains a hash of the arguments, of the CI test and
+        its parameters, and of the data, its mask and the bootstrap settings
+        of the dataframe, so that only a run with identical arguments resumes
+        from it.
+        """
+        dataframe = self.dataframe
+        hasher = hashlib.sha256(pickle.dumps(arguments))
+        hasher.update(pickle.dumps((type(self.cond_ind_test).__name__,
+                                    self._get_cond_ind_test_params())))
+        hasher.update(pickle.dumps((dataframe.missing_flag,
+                                    dataframe.analysis_mode,
+                                    sorted(dataframe.bootstrap.items()))))
+        for dataset_key in sorted(dataframe.values, key=str):
+            hasher.update(np.ascontiguousarray(
+                                dataframe.values[dataset_key]).tobytes())
+            if dataframe.mask is not None:
+                hasher.update(np.ascontiguousarray(
+                                dataframe.mask[dataset_key]).tobytes())
+        hasher.update(np.ascontiguousarray(
+                                dataframe.reference_points).tobytes())
+        return os.path.join(checkpoint_dir,
+                            'bootstrap_%s.pkl' % hasher.hexdigest()[:16])
+
+    def _get_cond_ind_test_params(self):
+        """Returns the constructor parameters of cond_ind_test.
+
+        The parameters of the __init__ methods of the class and its bases
+        are read from the attributes of the same name. The seed and
+        verbosity do not change the results of a bootstrap run and are left
+        out.
+        """
+        params = {}
+        for cls in type(self.cond_ind_test).__mro__:
+            if '__init__' not in vars(cls):
+                continue
+            try:
+                signature = inspect.signature(cls.__init__)
+            except (TypeError, ValueError):
+                continue
+            for name, param in signature.parameters.items():
+                if (name in ['self', 'seed', 'verbosity'] or name in params
+                        or param.kind in [param.VAR_POSITIONAL,
+                                          param.VAR_KEYWORD]):
+                    continue
+                params[name] = getattr(self.cond_ind_test, name, None)
+        return sorted(params.items())
+
+    @staticmethod
+    def _get_checkpoint_shard_path(checkpoint_path, start, end):
+        """Returns the file of the replicates start, ..., end - 1 of a checkpoint."""
+        return '%s_%d-%d.pkl' % (os.path.splitext(checkpoint_path)[0],
+                                 start, end)
+
+    @staticmethod
+    def _get_replicate_path(replicate_store, key):
+        """Returns the .npy file of boot_results[key] in replicate_store."""
+        return os.path.join(replicate_store, '%s.npy' % key)
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path):
+        """Returns the state stored in checkpoint_path or None."""
+        if not os.path.exists(checkpoint_path):
+            return None
+        with open(checkpoint_path, 'rb') as file:
+            return pickle.load(file)
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path, state):
+        """Writes state to checkpoint_path.
+
+        The state is written to a temporary file that then replaces the
+        checkpoint, so that a job killed while writing leaves the previous
+        checkpoint intact.
+        """
+        os.makedirs(os.path.dirname(checkpoint_path) or '.', exist_ok=True)
+        tmp_path = checkpoint_path + '.tmp'
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(state, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, checkpoint_path)
+
+    def _iter_bootstrap_replicates(self, method, method_args, boot_seeds,
+                                   n_jobs=1, executor=None, chunk_size=None):
+        """Yields the results of method for every seed in boot_seeds.
+
+        Results are yielded in the order of boot_seeds. If n_jobs != 1 or an
+        executor is given, the replicates are split into contiguous chunks
+        (of chunk_size replicates if given) that are run in worker processes
+        on copies of this object. At most two chunks per worker are submitted
+        ahead of the results consumed so far, and the pending chunks are
+        cancelled when the generator is closed, e.g., after early stopping.
+        """
+        if len(boot_seeds) == 0:
+            return
+
+        if n_jobs == 1 and executor is None:
+            self._prepare_bootstrap_replicates(method_args, boot_seeds)
+            for boot_seed in boot_seeds:
+                yield self._run_bootstrap_replicate(method, method_args,
+                                                    boot_seed)
+            return
+
+        chunks = None
+        if chunk_size is not None:
+            chunks = [np.arange(start, min(start + chunk_size, len(boot_seeds)))
+                      for start in range(0, len(boot_seeds), chunk_size)]
+        n_jobs = self._get_n_jobs(n_jobs)
+        for boot_res in self._iter_in_workers(_run_bootstrap_chunk, method,
+                                              method_args, boot_seeds,
+                                              n_jobs=n_jobs, executor=executor,
+                                              chunks=chunks,
+                                              max_pending=2 * n_jobs):
+            yield boot_res
+
+    @staticmethod
+    def _get_n_jobs(n_jobs):
+        """Returns the number of worker processes for n_jobs."""
+        if n_jobs is None or n_jobs < 1:
+            return os.cpu_count()
+        return n_jobs
+
+    def _iter_in_workers(self, run_chunk, method, method_args, tasks,
+                         n_jobs=1, executor=None, chunks=None,
+                         max_pending=None):
+        """Yields the results of run_chunk for all tasks from worker processes.
+
+        The tasks are split into contiguous chunks, and each chunk is passed
+        to run_chunk(pcmci, method, method_args, chunk) together with a copy of
+        this object in a worker process. Results are yielded in the order of
+        tasks.
+
+        chunks optionally gives the task indices of every chunk. If
+        max_pending is not None, at most max_pending chunks are submitted but
+        not yet yielded at any time, which bounds the number of results held
+        in memory.
+        """
+        n_jobs = self._get_n_jobs(n_jobs)
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=n_jobs)
+
+        if chunks is None:
+            # Several chunks per worker to balance tasks of unequal cost
+            n_chunks = min(len(tasks), 4 * n_jobs)
+            chunks = [chunk for chunk in np.array_split(np.arange(len(tasks)),
+                                                        n_chunks)
+                      if len(chunk) > 0]
+        if max_pending is None:
+            max_pending = len(chunks)
+
+        def submit(chunk):
+            return executor.submit(run_chunk, self, method, method_args,
+                                   [tasks[t] for t in chunk])
+
+        chunk_iterator = iter(chunks)
+        futures = deque()
+        try:
+            for chunk in itertools.islice(chunk_iterator, max_pending):
+                futures.append(submit(chunk))
+            while futures:
+                chunk_results = futures.popleft().result()
+                for chunk in itertools.islice(chunk_iterator, 1):
+                    futures.append(submit(chunk))
+                for result in chunk_results:
+                    yield result
+        finally:
+            for future in futures:
+                future.cancel()
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def run_bootstrap_of(self, method, method_args,
                         boot_samples=100,
                         boot_blocklength=1,
-                        conf_lev=0.9, seed=None):
+                        conf_lev=0.9, seed=None,
+                        n_jobs=1, executor=None,
+                        keep_replicates=True,
+                        max_link_frequency_se=None, min_boot_samples=10,
+                        checkpoint_dir=None, checkpoint_every=10,
+                        boot_range=None, nested_boot_samples=None,
+                        replicate_store=None,
+                        boot_method='block', boot_fraction=0.5,
+                        mergeable_aggregator=False):
         """Runs chosen method on bootstrap samples drawn from DataFrame.
         
         Bootstraps for tau=0 are drawn from [2xtau_max, ..., T] and all lagged
@@ -789,11 +1730,19 @@ class PCMCIbase():
         then 'most_frequent_links' containing the most frequent link outcome
         (specific link type) in each entry of graph, as well
         as 'link_frequency', containing the occurence frequency of the most
-        frequent link outcome, are returned. 
+        frequent link outcome, are returned. The frequencies of all link
+        types are returned in 'link_type_frequency', see
+        return_summary_results, so that the graphs of the bootstrap samples
+        need not be kept (see keep_replicates).
 
         Assumes that method uses cond_ind_test.run_test() function with cut_off
         = '2xtau_max'.
 
+        The replicates can be run in parallel worker processes. Every
+        bootstrap sample has its own seed spawned from seed and reseeds
+        cond_ind_test, so the results are identical to a serial run with the
+        same seed, independent of the number of workers.
+
         Parameters
         ----------
         method : str
@@ -802,16 +1751,103 @@ class PCMCIbase():
             Arguments passed to method.
         boot_samples : int
             Number of bootstrap samples to draw.
-        boot_blocklength : int, optional (default: 1)
-            Block length for block-bootstrap.
+        boot_blocklength : int or str, optional (default: 1)
+            Block length for block-bootstrap. If 'cube_root', the cube root
+            of the number of samples is used. If 'from_autocorrelation', it
+            is estimated once per dataset with
+            data_processing.get_block_length.
         conf_lev : float, optional (default: 0.9)
             Two-sided confidence interval for summary results.
         seed : int, optional(default = None)
-            Seed for RandomState (default_rng)
+            Seed for the SeedSequence from which the bootstrap samples are
+            seeded.
+        n_jobs : int, optional (default: 1)
+            Number of worker processes. If 1, replicates are run serially in
+            this process. If None or -1, all available CPUs are used.
+        executor : concurrent.futures.Executor, optional (default: None)
+            Executor to submit the replicates to instead of a new
+            ProcessPoolExecutor, e.g., an mpi4py.futures.MPIPoolExecutor. The
+            replicates are then split into chunks for n_jobs workers.
+        keep_replicates : bool, optional (default: True)
+            Whether to retain the results of every bootstrap sample. If False,
+            the results are aggregated by a BootstrapAggregator as they come
+            in, so that memory does not grow with boot_samples, and
+            boot_results is None. val_matrix_interval is then estimated from
+            histograms, see BootstrapAggregator.
+        max_link_frequency_se : float, optional (default: None)
+            If not None, no further bootstrap samples are drawn once the
+            binomial standard error sqrt(f(1-f)/b) of the link frequency f
+            after b samples is at most max_link_frequency_se in every entry
+            of the graph. boot_samples is then the maximum number of samples.
+        min_boot_samples : int, optional (default: 10)
+            Minimum number of bootstrap samples before stopping early.
+        checkpoint_dir : str, optional (default: None)
+            If not None, the results of the completed bootstrap samples (or
+            the running aggregate if keep_replicates is False) and the seeds
+            of all samples are written to a checkpoint file in this directory every
+            checkpoint_every samples and at the end. The results of the
+            samples since the previous checkpoint go to a separate shard
+            file, so that earlier samples are not written again. A call with
+            the same arguments, CI test and data resumes from the checkpoint.
+        checkpoint_every : int, optional (default: 10)
+            Number of bootstrap samples between checkpoints.
+        boot_range : tuple of ints, optional (default: None)
+            Range (b0, b1) of the bootstrap samples 0, ..., boot_samples - 1
+            to run. Sample b is seeded with
+            SeedSequence(seed).spawn(boot_samples)[b], so ranges can be run
+            on different processes or nodes and their results combined equal
+            those of a single run. Requires seed to be set. If None, all
+            samples are run.
+        nested_boot_samples : list of ints, optional (default: None)
+            Numbers of bootstrap samples B <= boot_samples for which the
+            summary results of the first B samples are returned as well.
+            Since the seed of a sample does not depend on boot_samples, these
+            equal the summary results of a run with boot_samples=B and the
+            same seed, so one run yields the results for all B.
+        replicate_store : str, optional (default: None)
+            If not None, the arrays of boot_results are stored as .npy files
+            named after their keys in this directory, e.g., on local scratch,
+            instead of in memory. Every bootstrap sample is written in place,
+            the returned arrays are read-only memory maps of these files, and
+            the summary results are computed in chunks of samples. Files of
+            previous runs in this directory are overwritten. Requires
+            keep_replicates=True.
+        boot_method : {'block', 'circular', 'stationary', 'subsample',
+                       'datasets'}, optional (default: 'block')
+            Resampling of the bootstrap samples. 'block' draws blocks of
+            length boot_blocklength with replacement until the sample has
+            the length of the data. 'circular' lets blocks wrap around the
+            end of the data, such that every sample is drawn equally often
+            on average. 'stationary' draws blocks of geometrically
+            distributed length with mean boot_blocklength that wrap around
+            as in 'circular'. 'subsample' draws a fraction
+            boot_fraction of the data as blocks without replacement (m-out-of-n
+            subsampling), so the method runs on fewer samples without
+            duplicates in every bootstrap sample. 'datasets' requires
+            analysis_mode='multiple' and draws whole datasets with
+            replacement, e.g., ensemble members, keeping all their time
+            points. boot_blocklength is then ignored.
+        boot_fraction : float, optional (default: 0.5)
+            Fraction of the reference points in every sample if boot_method
+            is 'subsample'.
+        mergeable_aggregator : bool, optional (default: False)
+            Whether to return a BootstrapAggregator with histograms of
+            val_matrix that can be merged with those of other runs also if
+            keep_replicates is True. Otherwise, the histograms are only kept
+            if keep_replicates is False, since the summary results are
+            computed from the retained samples.
 
         Returns
         -------
-        Dictionary of summary results and results for every bootstrap sample.
+        Dictionary of summary results, results for every bootstrap sample,
+        the number of bootstrap samples used (boot_samples), and the
+        BootstrapAggregator of all samples (aggregator), which can be merged
+        with the aggregators of other runs. aggregator is None if
+        keep_replicates is True and mergeable_aggregator is False. If
+        nested_boot_samples is given, also a dictionary {B: summary results
+        of the first B samples} (nested_summary_results) and a dictionary
+        {B: wall time in seconds until the first B samples were done}
+        (nested_computation_time).
         """
 
         valid_methods = ['run_pc_stable',
@@ -831,7 +1867,17 @@ class PCMCIbase():
 
         T = self.dataframe.largest_time_step
 
-        global_random_state = np.random.default_rng(seed)
+        # Replicate b is seeded with the b-th child of seed_sequence, so that
+        # any range of replicates can be run separately
+        seed_sequence = np.random.SeedSequence(seed)
+        if boot_range is None:
+            boot_range = (0, boot_samples)
+        elif seed is None:
+            raise ValueError("seed must be set if boot_range is given.")
+        b0, b1 = boot_range
+        if not 0 <= b0 < b1 <= boot_samples:
+            raise ValueError("boot_range must satisfy 0 <= b0 < b1 <= "
+                             "boot_samples.")
 
         # Extract tau_max to construct bootstrap draws
         if 'tau_max' not in method_args:
@@ -846,51 +1892,409 @@ class PCMCIbase():
             print("\n##\n## Running Bootstrap of %s " % method +
                   "\n##\n" +
                   "\nboot_samples = %s \n" % boot_samples +
-                  "\nboot_blocklength = %s \n" % boot_blocklength
+                  "\nboot_blocklength = %s \n" % boot_blocklength +
+                  "\nboot_method = %s \n" % boot_method
                   )
 
         # Set bootstrap attribute to be passed to dataframe
-        self.dataframe.bootstrap = {}
-        self.dataframe.bootstrap['boot_blocklength'] = boot_blocklength
+        self.dataframe.bootstrap = self._get_bootstrap_settings(
+                                boot_blocklength, boot_method, boot_fraction)
+
+        # Create all seeds up front so that they do not depend on the order
+        # in which replicates are evaluated
+        boot_seeds = [np.random.SeedSequence(seed_sequence.entropy,
+                                             spawn_key=(b,))
+                      for b in range(b0, b1)]
+        boot_samples = b1 - b0
+        if replicate_store is not None and not keep_replicates:
+            raise ValueError("replicate_store requires keep_replicates=True.")
+        if nested_boot_samples is None:
+            nested_boot_samples = []
+        if any(not 0 < n_boot <= boot_samples for n_boot in nested_boot_samples):
+            raise ValueError("nested_boot_samples must be in [1, boot_samples].")
+        original_random_state = self.cond_ind_test.random_state
 
         boot_results = {}
-        for b in range(boot_samples):
-            # Generate random state for this boot and set it in dataframe
-            # which will generate a draw with replacement
-            boot_seed = global_random_state.integers(0, boot_samples, 1)
-            boot_random_state = np.random.default_rng(boot_seed)
-            self.dataframe.bootstrap['random_state'] = boot_random_state
-
-            boot_res = getattr(self, method)(**method_args)
+        keep_histogram = mergeable_aggregator or not keep_replicates
+        aggregator = BootstrapAggregator(conf_lev=conf_lev,
+                                         keep_histogram=keep_histogram)
+        nested_summary_results = {}
+        nested_computation_time = {}
+        # Wall time of the samples run before a checkpoint was resumed
+        time_elapsed = 0.
+        n_boot_used = 0
+        converged = False
+        # Ranges (start, end) of the replicates in the checkpoint shards
+        checkpoint_shards = []
+
+        # Resume from a checkpoint of a previous run with the same arguments
+        checkpoint_path = None
+        if checkpoint_dir is not None:
+            checkpoint_path = self._get_checkpoint_path(checkpoint_dir,
+                    (method, method_args, boot_samples, boot_blocklength,
+                     conf_lev, seed, keep_replicates, max_link_frequency_se,
+                     min_boot_samples, boot_range, nested_boot_samples,
+                     replicate_store, boot_method, boot_fraction,
+                     mergeable_aggregator))
+            checkpoint = self._load_checkpoint(checkpoint_path)
+            if checkpoint is not None:
+                boot_seeds = checkpoint['boot_seeds']
+                # Stored arrays are only referenced in the checkpoint
+                for key in checkpoint['stored_keys']:
+                    boot_results[key] = np.load(
+                                self._get_replicate_path(replicate_store, key),
+                                mmap_mode='r+')
+                # The other replicates are collected from the shards
+                for start, end in checkpoint['shards']:
+                    shard = self._load_checkpoint(
+                        self._get_checkpoint_shard_path(checkpoint_path,
+                                                        start, end))
+                    for key, part in shard.items():
+                        if isinstance(part, np.ndarray):
+                            if key not in boot_results:
+                                boot_results[key] = np.empty(
+                                    (boot_samples,) + part.shape[1:],
+                                    dtype=part.dtype)
+                            boot_results[key][start:end] = part
+                        else:
+                            boot_results.setdefault(key, {}).update(part)
+                checkpoint_shards = checkpoint['shards']
+                aggregator = checkpoint['aggregator']
+                nested_summary_results = checkpoint['nested_summary_results']
+                nested_computation_time = checkpoint['nested_computation_time']
+                time_elapsed = checkpoint['time_elapsed']
+                n_boot_used = checkpoint['n_boot_done']
+                converged = checkpoint['converged']
+                if self.verbosity > 0:
+                    print("\nResuming after %d bootstrap samples from %s\n"
+                          % (n_boot_used, checkpoint_path))
+
+        # Frozen after hashing the checkpoint arguments
+        method_args = self._freeze_link_assumptions(method_args)
+        remaining_seeds = [] if converged else boot_seeds[n_boot_used:]
+        # With early stopping, small chunks keep the replicates computed
+        # beyond the stopping point few
+        chunk_size = None
+        if max_link_frequency_se is not None:
+            chunk_size = max(1, min_boot_samples
+                             // self._get_n_jobs(n_jobs))
+        replicates = self._iter_bootstrap_replicates(method, method_args,
+                                                     remaining_seeds,
+                                                     n_jobs=n_jobs,
+                                                     executor=executor,
+                                                     chunk_size=chunk_size)
+        time_start = time.time() - time_elapsed
+        for b, boot_res in enumerate(replicates, start=n_boot_used):
+            n_boot_used = b + 1
+            if n_boot_used in nested_boot_samples:
+                nested_computation_time[n_boot_used] = time.time() - time_start
+
+            aggregator.update(boot_res)
+            if not keep_replicates and n_boot_used in nested_boot_samples:
+                nested_summary_results[n_boot_used] = \
+                                        aggregator.get_summary_results()
 
             # Aggregate val_matrix and other arrays to new arrays with
             # boot_samples as first dimension. Lists and other objects
             # are stored in dictionary
-            for key in boot_res:
-                res_item = boot_res[key]
-                if type(res_item) is np.ndarray:
-                    if b == 0:
-                        boot_results[key] = np.empty((boot_samples,) 
-                                                     + res_item.shape,
-                                                     dtype=res_item.dtype) 
-                    boot_results[key][b] = res_item
-                else:
-                    if b == 0:
-                        boot_results[key] = {}
-                    boot_results[key][b] = res_item
+            if keep_replicates:
+                for key in boot_res:
+                    res_item = boot_res[key]
+                    if type(res_item) is np.ndarray:
+                        if b == 0 and replicate_store is None:
+                            boot_results[key] = np.empty((boot_samples,) 
+                                                         + res_item.shape,
+                                                         dtype=res_item.dtype) 
+                        elif b == 0:
+                            os.makedirs(replicate_store, exist_ok=True)
+                            boot_results[key] = np.lib.format.open_memmap(
+                                self._get_replicate_path(replicate_store, key),
+                                mode='w+', dtype=res_item.dtype,
+                                shape=(boot_samples,) + res_item.shape)
+                        boot_results[key][b] = res_item
+                    else:
+                        if b == 0:
+                            boot_results[key] = {}
+                        boot_results[key][b] = res_item
+
+            # Stop early once the link frequencies of all entries are precise
+            # enough
+            converged = (max_link_frequency_se is not None
+                    and n_boot_used >= min_boot_samples
+                    and np.max(aggregator.get_link_frequency_se())
+                        <= max_link_frequency_se)
+
+            if checkpoint_path is not None and (converged
+                    or n_boot_used % checkpoint_every == 0
+                    or n_boot_used == boot_samples):
+                # Only the replicates since the last checkpoint are written,
+                # to a new shard. Stored arrays are flushed and referenced
+                # by key.
+                start = checkpoint_shards[-1][1] if checkpoint_shards else 0
+                stored_keys = []
+                shard = {}
+                for key in boot_results:
+                    if isinstance(boot_results[key], np.memmap):
+                        boot_results[key].flush()
+                        stored_keys.append(key)
+                    elif isinstance(boot_results[key], np.ndarray):
+                        shard[key] = boot_results[key][start:n_boot_used]
+                    else:
+                        shard[key] = {b_shard: boot_results[key][b_shard]
+                                      for b_shard in range(start, n_boot_used)
+                                      if b_shard in boot_results[key]}
+                if shard and n_boot_used > start:
+                    self._save_checkpoint(self._get_checkpoint_shard_path(
+                                    checkpoint_path, start, n_boot_used), shard)
+                    checkpoint_shards = checkpoint_shards + [(start,
+                                                              n_boot_used)]
+                self._save_checkpoint(checkpoint_path, {
+                        'boot_seeds': boot_seeds,
+                        'stored_keys': stored_keys,
+                        'shards': checkpoint_shards,
+                        'aggregator': aggregator,
+                        'nested_summary_results': nested_summary_results,
+                        'nested_computation_time': nested_computation_time,
+                        'time_elapsed': time.time() - time_start,
+                        'n_boot_done': n_boot_used,
+                        'converged': converged})
+            if converged:
+                break
+        replicates.close()
+
+        # Hand back the stored arrays as read-only memory maps
+        if replicate_store is not None:
+            for key in boot_results:
+                if isinstance(boot_results[key], np.memmap):
+                    boot_results[key].flush()
+                    boot_results[key] = np.load(
+                                self._get_replicate_path(replicate_store, key),
+                                mmap_mode='r')
+
+        if n_boot_used < boot_samples:
+            if self.verbosity > 0:
+                print("\nStopped early after %d bootstrap samples.\n"
+                      % n_boot_used)
+            for key in boot_results:
+                if isinstance(boot_results[key], np.ndarray):
+                    boot_results[key] = boot_results[key][:n_boot_used]
 
         # Generate summary results
-        summary_results = self.return_summary_results(results=boot_results, 
-                                                      conf_lev=conf_lev)
+        if keep_replicates:
+            # Stored arrays are summarized in chunks of about 64 MB of
+            # val_matrix
+            chunk_size = None
+            if replicate_store is not None and 'val_matrix' in boot_results:
+                chunk_size = max(1, 2**26 // max(1,
+                                        boot_results['val_matrix'][0].nbytes))
+            summary_results = self.return_summary_results(results=boot_results,
+                                                          conf_lev=conf_lev,
+                                                          chunk_size=chunk_size)
+            for n_boot in nested_boot_samples:
+                if n_boot <= n_boot_used:
+                    nested_summary_results[n_boot] = self.return_summary_results(
+                        results={key: boot_results[key][:n_boot]
+                                 for key in ['graph', 'val_matrix']
+                                 if key in boot_results},
+                        conf_lev=conf_lev, chunk_size=chunk_size)
+        else:
+            summary_results = aggregator.get_summary_results()
+            boot_results = None
 
         # Reset bootstrap to None
         self.dataframe.bootstrap = None
+        self.cond_ind_test.random_state = original_random_state
+        self._frozen_link_assumptions = None
+
+        results = {'summary_results': summary_results,
+                   'boot_results': boot_results,
+                   'boot_samples': n_boot_used,
+                   'aggregator': aggregator if keep_histogram else None}
+        if nested_boot_samples:
+            results['nested_summary_results'] = dict(
+                                        sorted(nested_summary_results.items()))
+            results['nested_computation_time'] = dict(
+                                        sorted(nested_computation_time.items()))
+        return results
 
-        return {'summary_results': summary_results, 
-                'boot_results': boot_results}
+    def run_sliding_window_bootstrap_of(self, method, method_args,
+                        window_step,
+                        window_length,
+                        boot_samples=100,
+                        boot_blocklength=1,
+                        conf_lev=0.9, seed=None,
+                        n_jobs=1, executor=None,
+                        boot_method='block', boot_fraction=0.5,
+                        ):
+        """Runs chosen method on bootstrap samples of every sliding window.
+
+        Within every window taken as in run_sliding_window_of, bootstrap
+        samples are drawn as in run_bootstrap_of. All (window, sample) pairs
+        are scheduled on the same workers, and the results of a window are
+        aggregated by a BootstrapAggregator as they come in, so that only one
+        window is aggregated at a time and the results of single samples are
+        not retained. val_matrix_interval is therefore estimated from
+        histograms, see BootstrapAggregator.
+
+        Sample b of window w is seeded with SeedSequence(seed) extended by
+        the spawn key (w, b), so the results do not depend on the number of
+        workers.
+
+        Parameters
+        ----------
+        method : str
+            Chosen method among valid functions in PCMCI.
+        method_args : dict
+            Arguments passed to method.
+        window_step : int
+            Time step of windows.
+        window_length : int
+            Length of sliding window.
+        boot_samples : int, optional (default: 100)
+            Number of bootstrap samples to draw in every window.
+        boot_blocklength : int or str, optional (default: 1)
+            Block length for block-bootstrap. If 'cube_root', the cube root
+            of the number of samples is used. If 'from_autocorrelation', it
+            is estimated once per dataset with
+            data_processing.get_block_length.
+        conf_lev : float, optional (default: 0.9)
+            Two-sided confidence interval for summary results.
+        seed : int, optional(default = None)
+            Seed for the SeedSequence from which the bootstrap samples are
+            seeded.
+        n_jobs : int, optional (default: 1)
+            Number of worker processes. If 1, the samples are run serially
+            in this process. If None or -1, all available CPUs are used.
+        executor : concurrent.futures.Executor, optional (default: None)
+            Executor to submit the samples to instead of a new
+            ProcessPoolExecutor, e.g., an mpi4py.futures.MPIPoolExecutor.
+        boot_method : str, optional (default: 'block')
+            Resampling of the bootstrap samples, see run_bootstrap_of.
+        boot_fraction : float, optional (default: 0.5)
+            Fraction of the reference points of a window in every sample if
+            boot_method is 'subsample'.
+
+        Returns
+        -------
+        Dictionary of the summary results of every window
+        (window_summary_results), with windows as first dimension of every
+        array, and the first time step of every window
+        (window_start_points).
+        """
+
+        valid_methods = ['run_pc_stable',
+                          'run_mci',
+                          'get_lagged_dependencies',
+                          'run_fullci',
+                          'run_bivci',
+                          'run_pcmci',
+                          'run_pcalg',
+                          'run_lpcmci',
+                          'run_pcmciplus',]
+
+        if method not in valid_methods:
+            raise ValueError("method must be one of %s" % str(valid_methods))
+
+        if self.dataframe.reference_points_is_none is False:
+            raise ValueError("Reference points are not accepted in "
+                             "sliding windows analysis, align data before and use masking"
+                             " and/or missing values.")
+
+        if 'tau_max' not in method_args:
+            raise ValueError("tau_max must be explicitely set in method_args.")
+
+        if self.cond_ind_test.recycle_residuals:
+            # recycle_residuals clashes with sliding windows and bootstrap
+            # draws...
+            raise ValueError("cond_ind_test.recycle_residuals must be False.")
+
+        if self.verbosity > 0:
+            print("\n##\n## Running sliding window bootstrap of %s " % method +
+                  "\n##\n" +
+                  "\nwindow_step = %s \n" % window_step +
+                  "\nwindow_length = %s \n" % window_length +
+                  "\nboot_samples = %s \n" % boot_samples +
+                  "\nboot_blocklength = %s \n" % boot_blocklength +
+                  "\nboot_method = %s \n" % boot_method
+                  )
+
+        original_reference_points = deepcopy(self.dataframe.reference_points)
+        original_random_state = self.cond_ind_test.random_state
+
+        time_windows = self._get_time_windows(window_step, window_length)
+        n_windows = len(time_windows)
+
+        seed_sequence = np.random.SeedSequence(seed)
+        tasks = [(iw, time_window,
+                  np.random.SeedSequence(seed_sequence.entropy,
+                                         spawn_key=(iw, b)))
+                 for iw, time_window in enumerate(time_windows)
+                 for b in range(boot_samples)]
+
+        method_args = self._freeze_link_assumptions(method_args)
+        self.dataframe.bootstrap = self._get_bootstrap_settings(
+                                boot_blocklength, boot_method, boot_fraction)
+
+        if n_jobs == 1 and executor is None:
+            replicates = (result for _, window_tasks in itertools.groupby(
+                                            tasks, key=lambda task: task[0])
+                          for result in _run_window_bootstrap_chunk(self,
+                                    method, method_args, list(window_tasks)))
+        else:
+            # Chunks never span two windows. Bounding the number of pending
+            # chunks keeps the results waiting to be aggregated to a few
+            # windows' worth
+            n_jobs = self._get_n_jobs(n_jobs)
+            chunk_length = min(boot_samples, max(1,
+                               -(-len(tasks) // (4 * n_jobs))))
+            chunks = [np.arange(iw * boot_samples + b0,
+                                iw * boot_samples
+                                + min(b0 + chunk_length, boot_samples))
+                      for iw in range(n_windows)
+                      for b0 in range(0, boot_samples, chunk_length)]
+            replicates = self._iter_in_workers(_run_window_bootstrap_chunk,
+                                               method, method_args, tasks,
+                                               n_jobs=n_jobs,
+                                               executor=executor,
+                                               chunks=chunks,
+                                               max_pending=2 * n_jobs)
+
+        window_summary_results = {}
+        try:
+            for iw in range(n_windows):
+                if self.verbosity > 0:
+                    print("\n# Window start %s \n" % time_windows[iw][0])
+                aggregator = BootstrapAggregator(conf_lev=conf_lev)
+                for boot_res in itertools.islice(replicates, boot_samples):
+                    aggregator.update(boot_res)
+
+                # Stack the summary results with windows as first dimension,
+                # the list of link types is the same for all windows
+                summary_results = aggregator.get_summary_results()
+                for key in summary_results:
+                    if type(summary_results[key]) is not np.ndarray:
+                        window_summary_results[key] = summary_results[key]
+                        continue
+                    if iw == 0:
+                        window_summary_results[key] = np.empty(
+                                    (n_windows,) + summary_results[key].shape,
+                                    dtype=summary_results[key].dtype)
+                    window_summary_results[key][iw] = summary_results[key]
+        finally:
+            replicates.close()
+
+            # Reset bootstrap and reference points for further analyses
+            self.dataframe.bootstrap = None
+            self.dataframe.reference_points = original_reference_points
+            self.cond_ind_test.random_state = original_random_state
+            self._frozen_link_assumptions = None
+
+        return {'window_summary_results': window_summary_results,
+                'window_start_points': np.array([time_window[0]
+                                        for time_window in time_windows])}
 
     @staticmethod
-    def return_summary_results(results, conf_lev=0.9):
+    def return_summary_results(results, conf_lev=0.9, chunk_size=None):
         """Return summary results for causal graphs.
 
         The function returns summary_results of an array of PCMCI(+) results.
@@ -899,15 +2303,28 @@ class PCMCIbase():
         then 'most_frequent_links' containing the most frequent link outcome 
         (either 0 or 1 or a specific link type) in each entry of graph, as well 
         as 'link_frequency', containing the occurence frequency of the most 
-        frequent link outcome, are returned. 
+        frequent link outcome, are returned. Further, 'link_type_frequency'
+        contains the frequency of every link type in 'link_types' (all of
+        GRAPH_LINK_TYPES, followed by any other link types of string graphs)
+        in each entry of graph, so that, e.g., the
+        frequency of any link is
+        1 - link_type_frequency[link_types.index("")].
 
         Parameters
         ----------
         results : dict
             Results dictionary where the numpy arrays graph and val_matrix are
-            of shape (n_results, N, N, tau_max + 1).
+            of shape (n_results, N, N, tau_max + 1). graph can be a string
+            array or encoded by encode_graph, and most_frequent_links is
+            returned in the same format.
         conf_lev : float, optional (default: 0.9)
             Two-sided confidence interval for summary results.
+        chunk_size : int, optional (default: None)
+            If not None, the arrays are read in chunks of chunk_size results,
+            or of the same size along the entries of val_matrix for the
+            confidence intervals, e.g., for memory-mapped arrays that do not
+            fit in memory. The results equal those without chunks up to
+            floating point rounding of val_matrix_mean.
 
         Returns
         -------
@@ -918,61 +2335,67 @@ class PCMCIbase():
         summary_results = {}
 
         if 'graph' in results:
-            n_results, N, N, tau_max_plusone = results['graph'].shape
-            tau_max = tau_max_plusone - 1
-            # print(repr(results['graph']))
-            summary_results['most_frequent_links'] = np.zeros((N, N, tau_max_plusone),
-                                dtype=results['graph'][0].dtype)
-            summary_results['link_frequency'] = np.zeros((N, N, tau_max_plusone),
-                                dtype='float')
-            preferred_order = [ 
-                "", 
-                "x-x", 
-                # "x--",
-                # "--x",
-                # "x->",
-                # "<-x", 
-                # "x-o",
-                # "o-x",
-                "o-o",            
-                # "o--",
-                # "--o",
-                # "o->",
-                # "<-o",
-                # "---",
-                # "<->",
-                # "-->",
-                # "<--",
-                # "<-+",
-                # "+->",
-                ]
-
-            for (i, j) in itertools.product(range(N), range(N)):
-                for abstau in range(0, tau_max + 1):
-                    links, counts = np.unique(results['graph'][:,i,j,abstau], 
-                                        return_counts=True)
-                    list_of_most_freq = links[counts == counts.max()]
-                    if len(list_of_most_freq) == 1:
-                        choice = list_of_most_freq[0]
+            graph = results['graph']
+            n_results = graph.shape[0]
+            # Integer-code the link types and count them in all entries of
+            # the graph with a single bincount per chunk
+            n_entries = np.prod(graph.shape[1:], dtype='int')
+            graph_chunk_size = chunk_size or max(1, n_results)
+            counts_by_type = {}
+            for b0 in range(0, n_results, graph_chunk_size):
+                graph_chunk = np.asarray(graph[b0:b0 + graph_chunk_size])
+                link_types, codes = np.unique(graph_chunk, return_inverse=True)
+                codes = codes.reshape(len(graph_chunk), n_entries)
+                link_counts = np.bincount(
+                        (codes * n_entries + np.arange(n_entries)).ravel(),
+                        minlength=len(link_types)*n_entries).reshape(
+                                        (len(link_types),) + graph.shape[1:])
+                for link, counts in zip(link_types.tolist(), link_counts):
+                    if link in counts_by_type:
+                        counts_by_type[link] = counts_by_type[link] + counts
                     else:
-                        ordered_list = [link for link in preferred_order
-                                         if link in list_of_most_freq]
-                        if len(ordered_list) == 0:
-                            choice = "x-x"
-                        else:
-                            choice = ordered_list[0]
-                    summary_results['most_frequent_links'][i,j, abstau] = choice
-                    summary_results['link_frequency'][i,j, abstau] = \
-                                counts[counts == counts.max()].sum()/float(n_results)
+                        counts_by_type[link] = counts
+            link_types = sorted(counts_by_type)
+            link_counts = np.array([counts_by_type[link] for link in link_types])
+            (summary_results['most_frequent_links'],
+             summary_results['link_frequency']) = _summarize_link_counts(
+                                link_types,
+                                link_counts, n_results, graph.dtype)
+            (summary_results['link_type_frequency'],
+             summary_results['link_types']) = _get_link_type_frequency(
+                                link_types,
+                                link_counts, n_results, graph.dtype)
 
         # Confidence intervals for val_matrix; interval is two-sided
         c_int = (1. - (1. - conf_lev)/2.)
-        summary_results['val_matrix_mean'] = np.mean(
-                                    results['val_matrix'], axis=0)
+        val_matrix = results['val_matrix']
+        if chunk_size is None:
+            summary_results['val_matrix_mean'] = np.mean(val_matrix, axis=0)
 
-        summary_results['val_matrix_interval'] = np.stack(np.percentile(
-                                    results['val_matrix'], axis=0,
+            summary_results['val_matrix_interval'] = np.stack(np.percentile(
+                                    val_matrix, axis=0,
                                     q = [100*(1. - c_int), 100*c_int]), axis=3)
+            return summary_results
+
+        n_results = val_matrix.shape[0]
+        val_sum = np.zeros(val_matrix.shape[1:])
+        for b0 in range(0, n_results, chunk_size):
+            val_sum += np.sum(val_matrix[b0:b0 + chunk_size], axis=0)
+        summary_results['val_matrix_mean'] = val_sum / n_results
+
+        # Percentiles need all results of an entry, so these are read in
+        # chunks of entries of the same size
+        n_entries = np.prod(val_matrix.shape[1:], dtype='int')
+        val_entries = val_matrix.reshape(n_results, n_entries)
+        entry_chunk_size = max(1, chunk_size * n_entries // max(1, n_results))
+        val_interval = np.empty((2, n_entries),
+                dtype=val_matrix.dtype if val_matrix.dtype.kind == 'f' else 'float')
+        for e0 in range(0, n_entries, entry_chunk_size):
+            val_interval[:, e0:e0 + entry_chunk_size] = np.percentile(
+                        np.asarray(val_entries[:, e0:e0 + entry_chunk_size]),
+                        axis=0, q = [100*(1. - c_int), 100*c_int])
+        summary_results['val_matrix_interval'] = np.stack(
+                    val_interval.reshape((2,) + val_matrix.shape[1:]), axis=3)
         return summary_results
 
     @staticmethod
@@ -982,13 +2405,15 @@ class PCMCIbase():
         Parameters
         ---------
         graph : array of shape (N, N, tau_max+1)
-            Matrix format of graph in string format.
+            Matrix format of graph in string format or encoded by
+            encode_graph.
 
         Returns
         -------
         links : dict
             Dictionary of form {0:{(0, -1): o-o, ...}, 1:{...}, ...}.
         """
+        graph = PCMCIbase.decode_graph(graph)
         N = graph.shape[0]
 
         links = dict([(j, {}) for j in range(N)])